@@ -44,7 +44,9 @@ async def run_migrations_online() -> None:
         await connection.run_sync(do_run_migrations)
 
 
-if context.is_offline_mode():
+if (connection := config.attributes.get("connection")) is not None:
+    do_run_migrations(connection)
+elif context.is_offline_mode():
     run_migrations_offline()
 else:
     import asyncio
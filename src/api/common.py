@@ -1,36 +1,79 @@
+from typing import Sequence
+
 from fastapi import APIRouter, Request
-from fastapi.responses import JSONResponse
+from fastapi.responses import JSONResponse, Response
+from starlette.routing import BaseRoute
 
 from src.config import config
+from src.services.health_service import health_service
 from src.utils.api_structure import build_api_structure
-from src.utils.endpoints import get_endpoints_for_version
-from src.utils.exceptions import error_response_http, success_response
+from src.utils.endpoints import build_version_index, get_endpoints_for_version
+from src.utils.exceptions import (
+    encoded_success_response,
+    error_response_http,
+    success_response,
+)
+from src.utils.metrics import render_metrics
+from src.utils.response_cache import BASE_URL_PLACEHOLDER, BaseUrlResponseCache
 from src.utils.responses import custom_responses
 
 router = APIRouter(tags=["common"])
 
+api_info_cache = BaseUrlResponseCache()
+versions_cache = BaseUrlResponseCache()
+
+
+def build_common_responses(routes: Sequence[BaseRoute]) -> None:
+    api_info_cache.set(
+        {
+            "data": {
+                "info": {
+                    "developer": config.DEVELOPER_USERNAME,
+                    "github": config.GITHUB_URL,
+                    "docs": f"{BASE_URL_PLACEHOLDER}/docs",
+                    "redoc": f"{BASE_URL_PLACEHOLDER}/redoc",
+                    "api_url": f"{BASE_URL_PLACEHOLDER}/"
+                },
+                "api_structure": build_api_structure(routes, BASE_URL_PLACEHOLDER)
+            },
+            "message": "API structure successfully retrieved"
+        }
+    )
+
+    index = build_version_index(routes, (info["version"] for info in config.API_VERSIONS))
+    versions_cache.set(
+        {
+            "data": {
+                "versions": [
+                    {
+                        **info,
+                        "endpoints": get_endpoints_for_version(
+                            index, info["version"], BASE_URL_PLACEHOLDER
+                        )
+                    }
+                    for info in config.API_VERSIONS
+                ]
+            },
+            "message": "API versions successfully retrieved"
+        }
+    )
+
 
 @router.get(
     "/",
     summary="API Information",
-    description="Returns complete API information",
+    description=(
+        "Returns complete API information. "
+        "Pass `relative=true` to get paths without the base URL prefix."
+    ),
     responses=custom_responses
 )
-async def get_api_info(request: Request) -> JSONResponse:
+async def get_api_info(request: Request, relative: bool = False) -> Response:
     try:
-        return success_response(
-            data={
-                "info": {
-                    "developer": config.DEVELOPER_USERNAME,
-                    "github": config.GITHUB_URL,
-                    "docs": f"{request.base_url}docs",
-                    "redoc": f"{request.base_url}redoc",
-                    "api_url": str(request.base_url)
-                },
-                "api_structure": build_api_structure(request, request.app.routes)
-            },
-            message="API structure successfully retrieved"
-        )
+        if not api_info_cache.ready:
+            build_common_responses(request.app.routes)
+        base_url = "" if relative else str(request.base_url)
+        return encoded_success_response(api_info_cache.render(base_url))
     except Exception as e:
         raise error_response_http(500, "Internal Server Error", str(e))
 
@@ -38,20 +81,56 @@ async def get_api_info(request: Request) -> JSONResponse:
 @router.get(
     '/versions',
     summary="API Versions",
-    description="Returns information about all API versions with changes and endpoints",
+    description=(
+        "Returns information about all API versions with changes and endpoints. "
+        "Pass `relative=true` to get paths without the base URL prefix."
+    ),
     responses=custom_responses
 )
-async def get_versions_api(request: Request) -> JSONResponse:
+async def get_versions_api(request: Request, relative: bool = False) -> Response:
     try:
-        versions = config.API_VERSIONS
-        for version_info in versions:
-            version = version_info["version"]
-            version_info["endpoints"] = get_endpoints_for_version(
-                request, request.app.routes, version
-            )
-        return success_response(
-            data={"versions": versions},
-            message="API versions successfully retrieved"
-        )
+        if not versions_cache.ready:
+            build_common_responses(request.app.routes)
+        base_url = "" if relative else str(request.base_url)
+        return encoded_success_response(versions_cache.render(base_url))
     except Exception as e:
-        raise error_response_http(500, "Internal Server Error", str(e))
\ No newline at end of file
+        raise error_response_http(500, "Internal Server Error", str(e))
+
+@router.get(
+    '/metrics',
+    summary="Prometheus metrics",
+    description="Returns service metrics in the Prometheus text exposition format.",
+    include_in_schema=False
+)
+async def get_metrics() -> Response:
+    content, media_type = render_metrics()
+    return Response(content=content, media_type=media_type)
+
+
+@router.get(
+    '/health/live',
+    summary="Liveness probe",
+    description="Returns 200 as soon as the process is serving requests.",
+    include_in_schema=False
+)
+async def get_liveness() -> Response:
+    return success_response(data={"status": "alive"}, message="Service is alive")
+
+
+@router.get(
+    '/health/ready',
+    summary="Readiness probe",
+    description=(
+        "Returns 200 once the database, Redis and Twitch are available, 503 until then. "
+        "Results are cached for a few seconds."
+    ),
+    include_in_schema=False
+)
+async def get_readiness() -> Response:
+    report = await health_service.readiness()
+    if report["ready"]:
+        return success_response(data=report, message="Service is ready")
+    return JSONResponse(
+        content={"data": report, "message": "Service is not ready"},
+        status_code=503
+    )
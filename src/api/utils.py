@@ -1,20 +1,29 @@
+from functools import wraps
+
 from aiogram.utils.web_app import WebAppInitData, safe_parse_webapp_init_data
-from fastapi import Request
+from fastapi import Query, Request, Response
+from sqlalchemy.exc import SQLAlchemyError
 
 from src.config import config
 from src.database.models import User
+from src.database.unit_of_work import unit_of_work
+from src.schemas.user import parse_user_fields
 from src.services.user_service import user_service
-from src.utils.exceptions import unauthorized_error
+from src.utils.exceptions import bad_request_error, error_response_http, unauthorized_error
+from src.utils.server_timing import allow_server_timing, server_timing_pending, timed
 
 
-def auth(request: Request) -> WebAppInitData:
+async def auth(request: Request) -> WebAppInitData:
     try:
         auth_string = request.headers.get("initData", None)
         if auth_string:
-            data = safe_parse_webapp_init_data(
-                config.TOKEN_BOT.get_secret_value(),
-                auth_string
-            )
+            with timed("auth"):
+                data = safe_parse_webapp_init_data(
+                    config.TOKEN_BOT.get_secret_value(),
+                    auth_string
+                )
+            if data.user and server_timing_pending() and await user_service.is_admin(data.user.id):
+                allow_server_timing()
             return data
         raise unauthorized_error()
     except Exception:
@@ -25,4 +34,31 @@ async def check_user(tg_id: int) -> User:
     user = await user_service.get_user(tg_id)
     if not user:
         raise unauthorized_error()
-    return user
\ No newline at end of file
+    return user
+
+
+def user_fields(
+    fields: str | None = Query(
+        None,
+        description="Comma-separated list of user fields to return, e.g. `tg_id,role`"
+    )
+) -> tuple[str, ...] | None:
+    try:
+        return parse_user_fields(fields)
+    except ValueError as e:
+        raise bad_request_error(str(e))
+
+
+def transactional(endpoint):
+    @wraps(endpoint)
+    async def wrapper(*args, **kwargs):
+        try:
+            async with unit_of_work() as session:
+                response = await endpoint(*args, **kwargs)
+                if isinstance(response, Response) and response.status_code >= 400:
+                    await session.rollback()
+                return response
+        except SQLAlchemyError as e:
+            raise error_response_http(500, "Internal Server Error", str(e))
+
+    return wrapper
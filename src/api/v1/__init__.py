@@ -1,6 +1,6 @@
 from fastapi import APIRouter
 
-from src.api.v1 import schedule
+from src.api.v1 import schedule, stream
 from src.api.v1.admins import admin
 from src.api.v1.users import user
 from src.api.v1.webhooks import twitch
@@ -13,5 +13,6 @@ def setup_api_v1() -> APIRouter:
     router.include_router(admin.router)
     router.include_router(twitch.router)
     router.include_router(schedule.router)
+    router.include_router(stream.router)
 
     return router
\ No newline at end of file
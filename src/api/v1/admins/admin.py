@@ -1,11 +1,16 @@
 from typing import List
 
 from fastapi import APIRouter
+from fastapi.responses import FileResponse
 
-from src.api.utils import check_user
+from src.api.utils import check_user, transactional
+from src.database.base import engine, replica_engine
+from src.database.engine import pool_stats
+from src.services.outbox_service import outbox_relay
 from src.schemas.user import UserRole, UserSchema
 from src.services.user_service import user_service
-from src.utils.dependencies import UserDep
+from src.utils.cpu_profiler import profile_store
+from src.utils.dependencies import UserDep, UserFieldsDep
 from src.utils.exceptions import (
     error_response_http,
     forbidden_json_error,
@@ -24,15 +29,11 @@ router = APIRouter(prefix="/v1/admins", tags=["v1 - admins"])
     responses=custom_responses,
     response_model=List[UserSchema]
 )
-async def get_admins(limit: int = 100, offset: int = 0):
+async def get_admins(fields: UserFieldsDep, limit: int = 100, offset: int = 0):
     try:
-        admins = await user_service.get_all_admins(limit, offset)
-        admins_data = []
+        admins = await user_service.get_all_admins(limit, offset, fields)
+        admins_data = [UserSchema.dump(admin, fields) for admin in admins]
 
-        for admin in admins:
-            schema = UserSchema.from_models(admin)
-            admins_data.append(schema.model_dump(mode="json") if schema else None)
-        
         return success_response(
             data={"admins": admins_data},
             message=f"Retrieved {len(admins_data)} admins"
@@ -48,15 +49,14 @@ async def get_admins(limit: int = 100, offset: int = 0):
     responses=custom_responses,
     response_model=UserSchema
 )
-async def get_admin(id: int):
+async def get_admin(id: int, fields: UserFieldsDep):
     try:    
-        admin = await user_service.get_admin_by_id(id)
+        admin = await user_service.get_admin_by_id(id, fields)
         if not admin:
             return not_found_json_error("Admin not found")
 
-        schema = UserSchema.from_models(admin)
         return success_response(
-            data={"admin": schema.model_dump(mode="json") if schema else None},
+            data={"admin": UserSchema.dump(admin, fields)},
             message=f"Retrieved admin with id {id}"
         )
     except Exception as e:
@@ -70,7 +70,8 @@ async def get_admin(id: int):
     responses=custom_responses,
     response_model=UserSchema
 )
-async def make_admin_role(user_data: UserDep, tg_id: int):
+@transactional
+async def make_admin_role(user_data: UserDep, tg_id: int, fields: UserFieldsDep):
     try:
         user = await check_user(user_data.user.id if user_data.user else 100000)
         if user and user.role != UserRole.admin:
@@ -80,9 +81,8 @@ async def make_admin_role(user_data: UserDep, tg_id: int):
         if not user:
             return not_found_json_error(f"User with id {tg_id} not found")
 
-        schema = UserSchema.from_models(user)
         return success_response(
-            data={"user": schema.model_dump(mode="json") if schema else None},
+            data={"user": UserSchema.dump(user, fields)},
             message=f"User with id {tg_id} successfully set role to admin"
         )
     except Exception as e:
@@ -96,7 +96,8 @@ async def make_admin_role(user_data: UserDep, tg_id: int):
     responses=custom_responses,
     response_model=UserSchema
 )
-async def remove_admin_role(user_data: UserDep, tg_id: int):
+@transactional
+async def remove_admin_role(user_data: UserDep, tg_id: int, fields: UserFieldsDep):
     try:
         user = await check_user(user_data.user.id if user_data.user else 100000)
         if user and user.role != UserRole.admin:
@@ -108,10 +109,106 @@ async def remove_admin_role(user_data: UserDep, tg_id: int):
         if not user:
             return not_found_json_error(f"User with id {tg_id} not found")
 
-        schema = UserSchema.from_models(user)
         return success_response(
-            data={"user": schema.model_dump(mode="json") if schema else None},
+            data={"user": UserSchema.dump(user, fields)},
             message=f"User with id {tg_id} successfully removed admin role"
         )
     except Exception as e:
-        raise error_response_http(500, "Internal Server Error", str(e))
\ No newline at end of file
+        raise error_response_http(500, "Internal Server Error", str(e))
+
+@router.get(
+    "/database/pool",
+    summary="Get database pool stats",
+    description=(
+        "Returns the connection pool state and checkout wait times of the primary "
+        "database and, when one is configured, the replica. "
+        "Accessible to admins only."
+    ),
+    responses=custom_responses
+)
+async def get_database_pool_stats(user_data: UserDep):
+    try:
+        user = await check_user(user_data.user.id if user_data.user else 100000)
+        if user and user.role != UserRole.admin:
+            return forbidden_json_error("You do not have permission to view database stats.")
+
+        data = {"pool": pool_stats(engine)}
+        if replica_engine:
+            data["replica_pool"] = pool_stats(replica_engine)
+        return success_response(
+            data=data,
+            message="Successfully fetched the database pool stats"
+        )
+    except Exception as e:
+        raise error_response_http(500, "Internal Server Error", str(e))
+
+
+@router.get(
+    "/outbox",
+    summary="Get outbox relay stats",
+    description=(
+        "Returns the counters of the outbox relay that publishes broker messages, "
+        "including the Twitch stream events. Accessible to admins only."
+    ),
+    responses=custom_responses
+)
+async def get_outbox_stats(user_data: UserDep):
+    try:
+        user = await check_user(user_data.user.id if user_data.user else 100000)
+        if user and user.role != UserRole.admin:
+            return forbidden_json_error("You do not have permission to view outbox stats.")
+
+        return success_response(
+            data={"outbox": outbox_relay.stats()},
+            message="Successfully fetched the outbox relay stats"
+        )
+    except Exception as e:
+        raise error_response_http(500, "Internal Server Error", str(e))
+
+
+@router.get(
+    "/profiles",
+    summary="List CPU profiles",
+    description=(
+        "Returns the stored per-request CPU profiles, newest first. "
+        "Accessible to admins only."
+    ),
+    responses=custom_responses
+)
+async def get_profiles(user_data: UserDep):
+    try:
+        user = await check_user(user_data.user.id if user_data.user else 100000)
+        if user and user.role != UserRole.admin:
+            return forbidden_json_error("You do not have permission to view CPU profiles.")
+
+        profiles = profile_store.entries()
+        return success_response(
+            data={"profiles": profiles},
+            message=f"Retrieved {len(profiles)} CPU profiles"
+        )
+    except Exception as e:
+        raise error_response_http(500, "Internal Server Error", str(e))
+
+
+@router.get(
+    "/profiles/{profile_id}",
+    summary="Download CPU profile",
+    description=(
+        "Downloads a stored CPU profile in the speedscope format "
+        "(open it at https://www.speedscope.app). Accessible to admins only."
+    ),
+    responses=custom_responses
+)
+async def download_profile(user_data: UserDep, profile_id: str):
+    try:
+        user = await check_user(user_data.user.id if user_data.user else 100000)
+        if user and user.role != UserRole.admin:
+            return forbidden_json_error("You do not have permission to download CPU profiles.")
+
+        path = profile_store.path(profile_id)
+        if not path:
+            return not_found_json_error(f"Profile {profile_id} not found")
+
+        return FileResponse(path, media_type="application/json", filename=path.name)
+    except Exception as e:
+        raise error_response_http(500, "Internal Server Error", str(e))
@@ -1,6 +1,6 @@
 from fastapi import APIRouter
 
-from src.api.utils import check_user
+from src.api.utils import check_user, transactional
 from src.schemas.schedule import ScheduleCreate, ScheduleSchema, ScheduleUpdate
 from src.schemas.user import UserRole
 from src.services.schedule_service import schedule_service
@@ -47,6 +47,7 @@ async def get_schedule():
     responses=custom_responses,
     response_model=ScheduleSchema
 )
+@transactional
 async def create_schedule(user_data: UserDep, schedule_data: ScheduleCreate):
     try:
         user = await check_user(user_data.user.id if user_data.user else 100000)
@@ -73,6 +74,7 @@ async def create_schedule(user_data: UserDep, schedule_data: ScheduleCreate):
     responses=custom_responses,
     response_model=ScheduleSchema
 )
+@transactional
 async def update_schedule(id: int, user_data: UserDep, schedule_data: ScheduleUpdate):
     try:
         user = await check_user(user_data.user.id if user_data.user else 100000)
@@ -101,6 +103,7 @@ async def update_schedule(id: int, user_data: UserDep, schedule_data: ScheduleUp
     ),
     responses=custom_responses
 )
+@transactional
 async def delete_schedule(id: int, user_data: UserDep):
     try:
         user = await check_user(user_data.user.id if user_data.user else 100000)
@@ -0,0 +1,62 @@
+from fastapi import APIRouter
+
+from src.services.health_service import health_service
+from src.services.twitch_service import twitch_service
+from src.utils.exceptions import (
+    error_response_http,
+    not_found_json_error,
+    service_unavailable_error,
+    success_response,
+)
+from src.utils.responses import custom_responses
+
+router = APIRouter(prefix="/v1/stream", tags=["v1 - stream"])
+
+
+@router.get(
+    "/status",
+    summary="Get stream status",
+    description=(
+        "Returns whether the streamer is live right now, with the current title and game. "
+        "Pass `username` to get the status of another tracked streamer. "
+        "Served from an in-memory cache kept up to date by Twitch webhooks. "
+        "Accessible to all users."
+    ),
+    responses=custom_responses
+)
+async def get_stream_status(username: str | None = None):
+    if not health_service.is_started("twitch"):
+        return service_unavailable_error("Twitch client is starting, retry later")
+    try:
+        stream = await twitch_service.get_stream_status(username)
+        if stream is None:
+            return not_found_json_error(f"Streamer {username} is not tracked")
+
+        return success_response(
+            data={"stream": stream},
+            message="Successfully fetched the stream status"
+        )
+    except Exception as e:
+        raise error_response_http(500, "Internal Server Error", str(e))
+
+
+@router.get(
+    "/all",
+    summary="Get status of all tracked streams",
+    description=(
+        "Returns the stream status of every tracked streamer. "
+        "Accessible to all users."
+    ),
+    responses=custom_responses
+)
+async def get_all_stream_statuses():
+    if not health_service.is_started("twitch"):
+        return service_unavailable_error("Twitch client is starting, retry later")
+    try:
+        streams = await twitch_service.get_all_stream_statuses()
+        return success_response(
+            data={"streams": streams},
+            message=f"Successfully fetched the status of {len(streams)} streams"
+        )
+    except Exception as e:
+        raise error_response_http(500, "Internal Server Error", str(e))
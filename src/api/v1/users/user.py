@@ -2,9 +2,10 @@ from typing import List
 
 from fastapi import APIRouter
 
+from src.api.utils import transactional
 from src.schemas.user import UserCreate, UserSchema, UserUpdate
 from src.services.user_service import user_service
-from src.utils.dependencies import UserDep
+from src.utils.dependencies import UserDep, UserFieldsDep
 from src.utils.exceptions import error_response_http, not_found_json_error, success_response
 from src.utils.responses import custom_responses
 
@@ -18,15 +19,11 @@ router = APIRouter(prefix="/v1/users", tags=["v1 - users"])
     responses=custom_responses,
     response_model=List[UserSchema]
 )
-async def get_users(limit: int = 100, offset: int = 0):
+async def get_users(fields: UserFieldsDep, limit: int = 100, offset: int = 0):
     try:
-        users = await user_service.get_all_users(limit, offset)
-        users_data = []
+        users = await user_service.get_all_users(limit, offset, fields)
+        users_data = [UserSchema.dump(user, fields) for user in users]
 
-        for user in users:
-            schema = UserSchema.from_models(user)
-            users_data.append(schema.model_dump(mode="json") if schema else None)
-        
         return success_response(
             data={"users": users_data},
             message=f"Retrieved {len(users_data)} users"
@@ -42,15 +39,14 @@ async def get_users(limit: int = 100, offset: int = 0):
     responses=custom_responses,
     response_model=UserSchema
 )
-async def get_user(id: int):
+async def get_user(id: int, fields: UserFieldsDep):
     try:    
-        user = await user_service.get_user_by_id(id)
+        user = await user_service.get_user_by_id(id, fields)
         if not user:
             return not_found_json_error("User not found")
 
-        schema = UserSchema.from_models(user)
         return success_response(
-            data={"user": schema.model_dump(mode="json") if schema else None},
+            data={"user": UserSchema.dump(user, fields)},
             message=f"Retrieved user with id {id}"
         )
     except Exception as e:
@@ -64,15 +60,16 @@ async def get_user(id: int):
     responses=custom_responses,
     response_model=UserSchema
 )
-async def get_me(user_data: UserDep):
+@transactional
+async def get_me(user_data: UserDep, fields: UserFieldsDep):
     try:
         user = await user_service.register_user(user_data)
+        user_payload = UserSchema.dump(user, fields)
         if user and user.is_new:
             await user_service.set_not_new(user.tg_id)
 
-        schema = UserSchema.from_models(user)
         return success_response(
-            data={"user": schema.model_dump(mode="json") if schema else None},
+            data={"user": user_payload},
             message="Successfully retrieved current user"
         )
     except Exception as e:
@@ -86,7 +83,8 @@ async def get_me(user_data: UserDep):
     responses=custom_responses,
     response_model=UserSchema
 )
-async def update_me(user_data: UserDep):
+@transactional
+async def update_me(user_data: UserDep, fields: UserFieldsDep):
     try:
         tg_id = user_data.user.id if user_data.user else 100000
         user = await user_service.get_user(tg_id)
@@ -95,10 +93,9 @@ async def update_me(user_data: UserDep):
 
         update_data = UserUpdate.model_validate(user_data.model_dump(exclude_unset=True))
         user = await user_service.update_user(tg_id, update_data)
-        schema = UserSchema.from_models(user)
 
         return success_response(
-            data={"user": schema.model_dump(mode="json") if schema else None},
+            data={"user": UserSchema.dump(user, fields)},
             message="Successfully updated current user"
         )
     except Exception as e:
@@ -111,6 +108,7 @@ async def update_me(user_data: UserDep):
     description="Deletes the current user.",
     responses=custom_responses
 )
+@transactional
 async def delete_me(user_data: UserDep):
     try:
         tg_id = user_data.user.id if user_data.user else 100000
@@ -130,7 +128,8 @@ async def delete_me(user_data: UserDep):
     responses=custom_responses,
     response_model=UserSchema
 )
-async def create_user(user_data: UserCreate):
+@transactional
+async def create_user(user_data: UserCreate, fields: UserFieldsDep):
     try:
         if not user_data or not user_data.tg_id:
             return not_found_json_error("tg_id is required to create a user")
@@ -139,9 +138,8 @@ async def create_user(user_data: UserCreate):
         if not user:
             return not_found_json_error("Failed to create user")
 
-        schema = UserSchema.from_models(user)
         return success_response(
-            data={"user": schema.model_dump(mode="json") if schema else None},
+            data={"user": UserSchema.dump(user, fields)},
             message="Successfully created user"
         )
     except Exception as e:
@@ -153,6 +151,7 @@ async def create_user(user_data: UserCreate):
     description="Accepts the privacy policy.",
     responses=custom_responses
 )
+@transactional
 async def accept_privacy_policy(user_data: UserDep):
     try:
         tg_id = user_data.user.id if user_data.user else 100000
@@ -171,6 +170,7 @@ async def accept_privacy_policy(user_data: UserDep):
     description="Declines the privacy policy.",
     responses=custom_responses
 )
+@transactional
 async def decline_privacy_policy(user_data: UserDep):
     try:
         tg_id = user_data.user.id if user_data.user else 100000
@@ -1,8 +1,24 @@
+import json
+from datetime import datetime, timezone
+from logging import getLogger
+
 from fastapi import Request, Response
+from fastapi.responses import JSONResponse
 from faststream.rabbit.fastapi import RabbitRouter
 
 from src.config import config
+from src.services.health_service import health_service
+from src.services.outbox_service import outbox_relay
+from src.services.redis_service import redis_service
 from src.services.twitch_service import twitch_service
+from src.utils.exceptions import (
+    bad_request_json_error,
+    forbidden_json_error,
+    service_unavailable_error,
+)
+from src.utils.metrics import WEBHOOK_REJECTIONS
+
+logger = getLogger(__name__)
 
 router = RabbitRouter(
     url=config.RABBITMQ_URL.get_secret_value(),
@@ -10,40 +26,154 @@ router = RabbitRouter(
     tags=["v1 - webhooks - twitch"],
 )
 
+MESSAGE_ID_HEADER = "Twitch-Eventsub-Message-Id"
+MESSAGE_TIMESTAMP_HEADER = "Twitch-Eventsub-Message-Timestamp"
+MESSAGE_SIGNATURE_HEADER = "Twitch-Eventsub-Message-Signature"
+MESSAGE_TYPE_HEADER = "Twitch-Eventsub-Message-Type"
+
+
+def _is_fresh(timestamp: str) -> bool:
+    try:
+        sent_at = datetime.fromisoformat(timestamp)
+    except ValueError:
+        return False
+    if sent_at.tzinfo is None:
+        sent_at = sent_at.replace(tzinfo=timezone.utc)
+    age = (datetime.now(timezone.utc) - sent_at).total_seconds()
+    return abs(age) <= config.TWITCH_WEBHOOK_MESSAGE_TTL_SECONDS
+
+
+def _reject(reason: str, response: JSONResponse) -> JSONResponse:
+    WEBHOOK_REJECTIONS.labels("twitch", reason).inc()
+    return response
+
+
+async def _claim_message(message_id: str) -> bool:
+    try:
+        return await redis_service.claim_twitch_message(
+            message_id, config.TWITCH_WEBHOOK_MESSAGE_TTL_SECONDS
+        )
+    except Exception as e:
+        logger.warning("Failed to deduplicate Twitch message %s: %s", message_id, e)
+        return True
+
+
+async def _release_message(message_id: str) -> None:
+    try:
+        await redis_service.release_twitch_message(message_id)
+    except Exception as e:
+        logger.warning("Failed to release Twitch message %s: %s", message_id, e)
+
 
 @router.post("/callback")
 async def twitch_event(request: Request):
-    data = await request.json()
-    
-    if "challenge" in data:
-        return Response(content=data["challenge"], media_type="text/plain")
-    
+    message_id = request.headers.get(MESSAGE_ID_HEADER)
+    timestamp = request.headers.get(MESSAGE_TIMESTAMP_HEADER)
+    signature = request.headers.get(MESSAGE_SIGNATURE_HEADER)
+    if not message_id or not timestamp or not signature:
+        return _reject(
+            "missing_headers", forbidden_json_error("Missing Twitch EventSub signature headers")
+        )
+
+    if not _is_fresh(timestamp):
+        return _reject(
+            "stale", forbidden_json_error("Twitch EventSub message timestamp is too old")
+        )
+
+    body = await request.body()
+    if not twitch_service.verify_signature(message_id, timestamp, body, signature):
+        return _reject("bad_signature", forbidden_json_error("Invalid Twitch EventSub signature"))
+
+    try:
+        data = json.loads(body)
+    except ValueError:
+        data = None
+    if not isinstance(data, dict):
+        return _reject(
+            "malformed", bad_request_json_error("Twitch EventSub body must be a JSON object")
+        )
+
+    message_type = request.headers.get(MESSAGE_TYPE_HEADER)
+    if message_type == "webhook_callback_verification":
+        if not isinstance(challenge := data.get("challenge"), str):
+            return _reject(
+                "malformed",
+                bad_request_json_error("Twitch EventSub verification has no challenge")
+            )
+        return Response(content=challenge, media_type="text/plain")
+
+    if not await _claim_message(message_id):
+        logger.debug("Duplicate Twitch message %s skipped", message_id)
+        return {"ok": True}
+
+    if message_type == "revocation":
+        subscription = data.get("subscription", {})
+        logger.warning(
+            "Twitch revoked subscription %s (%s): %s",
+            subscription.get("id"), subscription.get("type"), subscription.get("status")
+        )
+        return {"ok": True}
+
+    if not health_service.is_started("database"):
+        # Nothing can be stored yet, Twitch redelivers the event after a 503
+        await _release_message(message_id)
+        return _reject(
+            "db_not_ready", service_unavailable_error("Database is not ready yet, retry later")
+        )
+
+    try:
+        await _store_event(data)
+    except Exception as e:
+        # Twitch retries a failed delivery, so the event is only acknowledged once it is stored
+        logger.error("⚠️ Failed to store Twitch message %s: %s", message_id, e)
+        await _release_message(message_id)
+        return _reject(
+            "store_failed",
+            service_unavailable_error("Failed to store the Twitch event, retry later")
+        )
+    return {"ok": True}
+
+
+async def _store_event(data: dict) -> None:
     subscription = data.get("subscription", {})
     event = data.get("event", {})
     subscription_type = subscription.get("type")
-    
-    if subscription_type == "stream.online" and event:
-        user_id = event["broadcaster_user_id"]
-        user_name = event["broadcaster_user_name"]
-        stream_info = await twitch_service.get_current_stream_info(user_id)
-        await router.broker.publish(
-            {
-                "event": "stream_online",
-                "user_name": user_name,
-                "title": stream_info["title"],
-                "game_name": stream_info["game_name"]
-            },
-            queue="twitch_streams",
-        )
-    elif subscription_type == "stream.offline" and event:
-        user_name = event["broadcaster_user_name"]
-        await router.broker.publish(
-            {
-                "event": "stream_offline",
-                "user_name": user_name,
-                "title": None,
-                "game_name": None
-            },
-            queue="twitch_streams",
+    if subscription_type not in ("stream.online", "stream.offline") or not event:
+        return
+
+    user_id = event["broadcaster_user_id"]
+    user_name = event["broadcaster_user_name"]
+    if subscription_type == "stream.offline":
+        twitch_service.handle_stream_offline(user_id, user_name)
+    await outbox_relay.enqueue(
+        "twitch_streams",
+        {
+            "event": "stream_online" if subscription_type == "stream.online" else "stream_offline",
+            "user_id": user_id,
+            "user_name": user_name,
+        },
+    )
+
+
+async def _build_stream_message(payload: dict) -> dict:
+    # Helix is only asked for the title and game when the stored event is relayed
+    if "user_id" not in payload:
+        return payload
+    if not health_service.is_started("twitch"):
+        raise RuntimeError("Twitch client is not started yet")
+
+    title = game_name = None
+    if payload["event"] == "stream_online":
+        stream_info = await twitch_service.handle_stream_online(
+            payload["user_id"], payload["user_name"]
         )
-    return {"ok": True}
+        title, game_name = stream_info["title"], stream_info["game_name"]
+    return {
+        "event": payload["event"],
+        "user_name": payload["user_name"],
+        "title": title,
+        "game_name": game_name
+    }
+
+
+outbox_relay.register_preparer("twitch_streams", _build_stream_message)
@@ -6,32 +6,88 @@ from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
 
 from src.api import setup_api_router
+from src.api.common import build_common_responses
+from src.api.v1.webhooks.twitch import router as twitch_router
 from src.config import config
 from src.database import close_db, init_db
+from src.database.migrations import SchemaError
+from src.middlewares.metrics import MetricsMiddleware
+from src.middlewares.profiler import ProfilerMiddleware
+from src.middlewares.query_profiler import QueryProfilerMiddleware
 from src.middlewares.rate_limit import RateLimitMiddleware
+from src.middlewares.read_your_writes import ReadYourWritesMiddleware
+from src.middlewares.server_timing import ServerTimingMiddleware
+from src.services.health_service import health_service
+from src.services.leader_service import leader_service
+from src.services.loop_monitor import loop_monitor
+from src.services.outbox_service import outbox_relay
+from src.services.redis_service import redis_service
+from src.services.scheduler import job_scheduler
 from src.services.twitch_service import twitch_service
+from src.utils.logger import setup_logging, start_log_listener, stop_log_listener
+from src.utils.metrics import mark_process_dead
 
 logger = getLogger(__name__)
 
 
-@asynccontextmanager
-async def lifespan(app: FastAPI) -> AsyncGenerator:
-    logger.debug("Starting application initialization...")
+async def start_database() -> None:
     logger.debug("Initializing database...")
     await init_db()
     logger.debug("Database initialized successfully")
+    await outbox_relay.start(twitch_router.broker)
+    job_scheduler.add_job(
+        "outbox-cleanup",
+        outbox_relay.cleanup,
+        interval=config.OUTBOX_CLEANUP_INTERVAL_SECONDS,
+        leader_only=True,
+    )
+    logger.debug("Outbox relay started")
+
+
+async def start_twitch() -> None:
     await twitch_service.startup()
     logger.debug("TwitchService started successfully")
-    logger.debug("Application started successfully")
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI) -> AsyncGenerator:
+    # Workers are spawned, not forked, so each one sets up its own handlers
+    setup_logging()
+    start_log_listener()
+    await loop_monitor.start()
+    logger.debug("Starting application initialization...")
+    build_common_responses(app.routes)
+    logger.debug("Common API responses precomputed")
+    await leader_service.start()
+    logger.debug("Leader election started")
+    # Slow dependencies come up in the background, /health/ready reports when they are done
+    health_service.start(
+        {"database": start_database, "twitch": start_twitch}, fatal=(SchemaError,)
+    )
+    logger.debug("Application started, dependencies are initializing in the background")
     
     yield
 
     logger.debug("Shutting down application...")
-    await twitch_service.shutdown()
-    logger.debug("TwitchService shutdown completed")
+    await health_service.stop()
+    logger.debug("Pending startup steps cancelled")
+    await job_scheduler.shutdown()
+    logger.debug("Background jobs cancelled")
+    await outbox_relay.stop()
+    logger.debug("Outbox relay stopped")
+    await leader_service.stop()
+    logger.debug("Leader election stopped")
+    if health_service.is_started("twitch"):
+        await twitch_service.shutdown()
+        logger.debug("TwitchService shutdown completed")
     logger.debug("Closing database connections...")
     await close_db()
     logger.debug("Database connections closed successfully")
+    await redis_service.close()
+    logger.debug("Redis connections closed")
+    await loop_monitor.stop()
+    mark_process_dead()
+    stop_log_listener()
 
 
 app = FastAPI(
@@ -49,4 +105,9 @@ app.add_middleware(
     allow_headers=["*"],
 )
 app.add_middleware(RateLimitMiddleware)
+app.add_middleware(ServerTimingMiddleware)
+app.add_middleware(ReadYourWritesMiddleware)
+app.add_middleware(QueryProfilerMiddleware)
+app.add_middleware(MetricsMiddleware)
+app.add_middleware(ProfilerMiddleware)
 app.include_router(setup_api_router())
\ No newline at end of file
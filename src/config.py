@@ -1,5 +1,5 @@
-from datetime import datetime
 from pathlib import Path
+from typing import Literal
 
 from pydantic import Field, SecretStr
 from pydantic_settings import BaseSettings, SettingsConfigDict
@@ -8,10 +8,6 @@ ROOT_DIR = Path(__file__).parent.parent
 ENV_FILE = ROOT_DIR / ".env"
 LOGS_DIR = ROOT_DIR / "logs"
 
-now = datetime.now().replace(microsecond=0)
-log_filename_time = now.strftime("%Y-%m-%d_%H-%M-%S")
-
-
 if not ENV_FILE.exists():
     raise FileNotFoundError(f".env file not found at: {ENV_FILE}")
 
@@ -24,6 +20,7 @@ class Config(BaseSettings):
     
     REDIS_URL: SecretStr
     DB_URL: SecretStr
+    DB_REPLICA_URL: SecretStr | None = None
     RABBITMQ_URL: SecretStr
 
     BACKEND_URL: SecretStr
@@ -35,6 +32,12 @@ class Config(BaseSettings):
     APP_HOST: str = "0.0.0.0"
     APP_PORT: int = 8008
     APP_RELOAD: bool = False
+    APP_WORKERS: int = 1
+    APP_LOOP: Literal["auto", "asyncio", "uvloop"] = "auto"
+    APP_HTTP: Literal["auto", "h11", "httptools"] = "auto"
+    APP_BACKLOG: int = 2048
+    APP_KEEPALIVE_SECONDS: int = 5
+    APP_LIMIT_CONCURRENCY: int | None = None
 
     PROJECT_VERSION: str = "v2.0.1-beta"
     API_TITLE: str = "Backend API Vastik Manager"
@@ -59,11 +62,69 @@ class Config(BaseSettings):
 
     ADMIN_IDS: list[int] = Field(default_factory=lambda: [8042671345, 1283679412])
 
+    DB_ECHO: bool = False
+    DB_POOL_SIZE: int = 10
+    DB_MAX_OVERFLOW: int = 20
+    DB_POOL_TIMEOUT_SECONDS: float = 10.0
+    DB_POOL_RECYCLE_SECONDS: int = 30 * 60
+    DB_POOL_PRE_PING: bool = True
+    DB_SQLITE_POOL_SIZE: int = 5
+    DB_SQLITE_JOURNAL_MODE: str = "WAL"
+    DB_SQLITE_SYNCHRONOUS: str = "NORMAL"
+    DB_SQLITE_MMAP_SIZE: int = 256 * 1024 * 1024
+    DB_SQLITE_CACHE_SIZE: int = -64 * 1024
+    DB_SQLITE_BUSY_TIMEOUT_MS: int = 5000
+    DB_AUTO_MIGRATE: bool = True
+    DB_MIGRATION_LOCK_SECONDS: int = 5 * 60
+    DB_MIGRATION_WAIT_SECONDS: int = 2 * 60
+    DB_SLOW_QUERY_MS: float = 200.0
+    DB_QUERY_COUNT_WARN: int = 20
+
     RATELIMIT_MAX_REQUESTS: int = 60
     RATELIMIT_WINDOW_SECONDS: int = 300
     RATELIMIT_BAN_SECONDS: int = 1800
 
+    SERVER_TIMING_ENABLED: bool = False
+    SERVER_TIMING_HEADER: str = "X-Server-Timing"
+
+    PROFILE_HEADER: str = "X-Profile"
+    PROFILE_SAMPLE_RATE: float = 0.0
+    PROFILE_INTERVAL_MS: float = 5.0
+    PROFILE_MAX_FILES: int = 50
+    PROFILES_DIR: Path = LOGS_DIR / "profiles"
+
+    LOOP_MONITOR_ENABLED: bool = True
+    LOOP_MONITOR_INTERVAL_SECONDS: float = 0.1
+    LOOP_LAG_THRESHOLD_MS: float = 100.0
+    ASYNCIO_DEBUG: bool = False
+
+    HEALTH_CACHE_SECONDS: float = 5.0
+    HEALTH_CHECK_TIMEOUT_SECONDS: float = 2.0
+    STARTUP_RETRY_BASE_SECONDS: float = 1.0
+    STARTUP_RETRY_MAX_SECONDS: float = 60.0
+
     STREAMER_USERNAME: str = "lemmychka"
+    STREAMER_USERNAMES: list[str] = Field(default_factory=list)
+    TWITCH_API_BASE_URL: str = "https://api.twitch.tv/helix/"
+    TWITCH_AUTH_BASE_URL: str = "https://id.twitch.tv/oauth2/"
+    TWITCH_WEBHOOK_MESSAGE_TTL_SECONDS: int = 600
+    TWITCH_STREAM_INFO_TTL_SECONDS: int = 60
+    TWITCH_SUBSCRIPTION_MAX_AGE_HOURS: int = 120
+    TWITCH_SUBSCRIPTION_CHECK_INTERVAL_SECONDS: int = 24 * 60 * 60
+    TWITCH_SUBSCRIPTION_MIN_CHECK_SECONDS: int = 60
+
+    OUTBOX_BATCH_SIZE: int = 100
+    OUTBOX_POLL_INTERVAL_SECONDS: float = 5.0
+    OUTBOX_RETRY_BASE_SECONDS: float = 1.0
+    OUTBOX_RETRY_MAX_SECONDS: float = 300.0
+    OUTBOX_RETENTION_HOURS: int = 72
+    OUTBOX_CLEANUP_INTERVAL_SECONDS: int = 60 * 60
+
+    SCHEDULER_JITTER: float = 0.1
+    SCHEDULER_BACKOFF_BASE_SECONDS: float = 30.0
+    SCHEDULER_BACKOFF_MAX_SECONDS: float = 3600.0
+    LEADER_LOCK_SECONDS: int = 30
+    LEADER_RENEW_SECONDS: float = 10.0
 
     DEVELOPER_USERNAME: str = "Kitty_Ilnazik"
     GITHUB_URL: str = "https://github.com/Lemmy-VTube/backend"
@@ -78,7 +139,18 @@ class ConfigLog(BaseSettings):
     LOG_LEVEL: str = "INFO"
     LOG_FORMAT: str = "%(asctime)s - [%(levelname)s] - %(name)s: %(message)s"
     LOG_DATE_FORMAT: str = "%d.%m.%Y %H:%M:%S"
-    LOG_FILE: Path = LOGS_DIR / f"app_{log_filename_time}.log"
+    LOG_FILE: Path = LOGS_DIR / "app.log"
+    LOG_PER_PROCESS: bool = False
+    LOG_MAX_BYTES: int = 50 * 1024 * 1024
+    LOG_ROTATE_WHEN: str = "midnight"
+    LOG_ROTATE_INTERVAL: int = 1
+    LOG_BACKUP_COUNT: int = 14
+    LOG_RETENTION_DAYS: int = 30
+    LOG_COMPRESS: bool = True
+    LOG_QUEUE_SIZE: int = 10_000
+    LOG_QUEUE_POLICY: Literal["drop", "block"] = "drop"
+    LOG_JSON: bool = False
+    LOG_SAMPLE_RATES: dict[str, float] = Field(default_factory=dict)
 
 
 config = Config()  # type: ignore
@@ -1,3 +1,3 @@
-from src.database.base import async_session, close_db, init_db
+from src.database.base import async_session, close_db, init_db, primary_session
 
-__all__ = ["async_session", "init_db", "close_db"]
\ No newline at end of file
+__all__ = ["async_session", "primary_session", "init_db", "close_db"]
@@ -1,16 +1,30 @@
-from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+from sqlalchemy.ext.asyncio import async_sessionmaker
 
 from src.config import config
-from src.database.models import Base
+from src.database.engine import build_engine
+from src.database.migrations import ensure_schema
+from src.database.routing import RoutingSession
 
-engine = create_async_engine(url=config.DB_URL.get_secret_value(), echo=False)
-async_session = async_sessionmaker(bind=engine, expire_on_commit=False)
+engine = build_engine(config.DB_URL.get_secret_value())
+replica_engine = (
+    build_engine(config.DB_REPLICA_URL.get_secret_value(), "replica")
+    if config.DB_REPLICA_URL
+    else None
+)
+async_session = async_sessionmaker(
+    bind=engine,
+    expire_on_commit=False,
+    sync_session_class=RoutingSession,
+    replica=replica_engine,
+)
+primary_session = async_sessionmaker(bind=engine, expire_on_commit=False)
 
 
 async def init_db() -> None:
-    async with engine.begin() as conn:
-        await conn.run_sync(Base.metadata.create_all)
+    await ensure_schema(engine)
 
 
 async def close_db() -> None:
-    await engine.dispose()
\ No newline at end of file
+    await engine.dispose()
+    if replica_engine:
+        await replica_engine.dispose()
@@ -0,0 +1,165 @@
+import os
+from functools import lru_cache
+from logging import getLogger
+from time import perf_counter
+from typing import Any
+
+from sqlalchemy import event, exc
+from sqlalchemy.engine import URL, make_url
+from sqlalchemy.ext.asyncio import AsyncEngine, create_async_engine
+from sqlalchemy.pool import AsyncAdaptedQueuePool
+
+from src.config import config
+from src.database.profiler import record_query
+from src.utils.metrics import (
+    DB_POOL_CHECKED_OUT,
+    DB_POOL_CHECKOUT_WAIT,
+    DB_POOL_TIMEOUTS,
+    DB_QUERY_LATENCY,
+)
+
+logger = getLogger(__name__)
+
+
+class PoolMetrics:
+    def __init__(self):
+        self.checkouts = 0
+        self.timeouts = 0
+        self.wait_total = 0.0
+        self.wait_max = 0.0
+
+    def observe(self, wait: float) -> None:
+        self.checkouts += 1
+        self.wait_total += wait
+        self.wait_max = max(self.wait_max, wait)
+
+    def stats(self) -> dict[str, Any]:
+        return {
+            "checkouts": self.checkouts,
+            "timeouts": self.timeouts,
+            "wait_avg_ms": round(self.wait_total / self.checkouts * 1000, 3)
+            if self.checkouts else 0.0,
+            "wait_max_ms": round(self.wait_max * 1000, 3),
+        }
+
+
+class MeasuredQueuePool(AsyncAdaptedQueuePool):
+    engine_name = "primary"
+    metrics = PoolMetrics()
+
+    def connect(self):
+        started = perf_counter()
+        try:
+            connection = super().connect()
+        except exc.TimeoutError:
+            self.metrics.timeouts += 1
+            DB_POOL_TIMEOUTS.labels(self.engine_name).inc()
+            raise
+        wait = perf_counter() - started
+        self.metrics.observe(wait)
+        DB_POOL_CHECKOUT_WAIT.labels(self.engine_name).observe(wait)
+        return connection
+
+
+@lru_cache
+def _measured_pool(name: str) -> type[MeasuredQueuePool]:
+    # A subclass per engine, because the pool is rebuilt from its class on dispose()
+    return type(
+        "MeasuredQueuePool", (MeasuredQueuePool,), {"engine_name": name, "metrics": PoolMetrics()}
+    )
+
+
+def _is_sqlite_memory(url: URL) -> bool:
+    return url.database in (None, "", ":memory:") or "mode=memory" in str(url)
+
+
+def _engine_options(url: URL, name: str) -> dict[str, Any]:
+    options: dict[str, Any] = {"echo": config.DB_ECHO}
+    if url.get_backend_name() == "sqlite":
+        if not _is_sqlite_memory(url):
+            options.update(
+                poolclass=_measured_pool(name),
+                pool_size=config.DB_SQLITE_POOL_SIZE,
+                max_overflow=0,
+                pool_timeout=config.DB_POOL_TIMEOUT_SECONDS,
+            )
+        return options
+
+    options.update(
+        poolclass=_measured_pool(name),
+        pool_size=config.DB_POOL_SIZE,
+        max_overflow=config.DB_MAX_OVERFLOW,
+        pool_timeout=config.DB_POOL_TIMEOUT_SECONDS,
+        pool_recycle=config.DB_POOL_RECYCLE_SECONDS,
+        pool_pre_ping=config.DB_POOL_PRE_PING,
+    )
+    return options
+
+
+def _set_sqlite_pragmas(dbapi_connection, connection_record) -> None:
+    cursor = dbapi_connection.cursor()
+    try:
+        cursor.execute(f"PRAGMA busy_timeout={config.DB_SQLITE_BUSY_TIMEOUT_MS}")
+        cursor.execute(f"PRAGMA journal_mode={config.DB_SQLITE_JOURNAL_MODE}")
+        cursor.execute(f"PRAGMA synchronous={config.DB_SQLITE_SYNCHRONOUS}")
+        cursor.execute(f"PRAGMA mmap_size={config.DB_SQLITE_MMAP_SIZE}")
+        cursor.execute(f"PRAGMA cache_size={config.DB_SQLITE_CACHE_SIZE}")
+    finally:
+        cursor.close()
+
+
+def _instrument(engine: AsyncEngine, name: str) -> None:
+    sync_engine = engine.sync_engine
+
+    @event.listens_for(sync_engine, "before_cursor_execute")
+    def _before_execute(conn, cursor, statement, parameters, context, executemany):
+        conn.info.setdefault("query_started", []).append(perf_counter())
+
+    @event.listens_for(sync_engine, "after_cursor_execute")
+    def _after_execute(conn, cursor, statement, parameters, context, executemany):
+        elapsed = perf_counter() - conn.info["query_started"].pop()
+        operation = statement.lstrip().split(None, 1)[0].upper() if statement else "UNKNOWN"
+        DB_QUERY_LATENCY.labels(name, operation).observe(elapsed)
+        record_query(statement, elapsed)
+
+    @event.listens_for(sync_engine, "handle_error")
+    def _on_error(context):
+        started = context.connection.info.get("query_started") if context.connection else None
+        if started:
+            started.pop()
+
+    @event.listens_for(sync_engine, "checkout")
+    def _on_checkout(dbapi_connection, connection_record, connection_proxy):
+        DB_POOL_CHECKED_OUT.labels(name).inc()
+
+    @event.listens_for(sync_engine, "checkin")
+    def _on_checkin(dbapi_connection, connection_record):
+        DB_POOL_CHECKED_OUT.labels(name).dec()
+
+
+def build_engine(url: str, name: str = "primary") -> AsyncEngine:
+    parsed = make_url(url)
+    engine = create_async_engine(parsed, **_engine_options(parsed, name))
+    if parsed.get_backend_name() == "sqlite":
+        event.listen(engine.sync_engine, "connect", _set_sqlite_pragmas)
+    _instrument(engine, name)
+    # A forked worker (gunicorn preload) must not reuse the parent's sockets, so it drops
+    # them without closing. Uvicorn spawns its workers and never triggers the hook.
+    os.register_at_fork(after_in_child=lambda: engine.sync_engine.dispose(close=False))
+    logger.debug("Database engine created: %s", engine.pool.status())
+    return engine
+
+
+def pool_stats(engine: AsyncEngine) -> dict[str, Any]:
+    pool = engine.pool
+    stats: dict[str, Any] = {"pool": type(pool).__name__, "status": pool.status()}
+    if isinstance(pool, AsyncAdaptedQueuePool):
+        stats.update(
+            size=pool.size(),
+            checked_in=pool.checkedin(),
+            checked_out=pool.checkedout(),
+            overflow=pool.overflow(),
+        )
+    if isinstance(pool, MeasuredQueuePool):
+        stats.update(engine=pool.engine_name, **pool.metrics.stats())
+    return stats
@@ -0,0 +1,128 @@
+import asyncio
+import uuid
+from logging import getLogger
+from time import monotonic
+
+from alembic import command
+from alembic.autogenerate import compare_metadata
+from alembic.config import Config as AlembicConfig
+from alembic.migration import MigrationContext
+from alembic.script import ScriptDirectory
+from redis.exceptions import RedisError
+from sqlalchemy import Connection, inspect, text
+from sqlalchemy.ext.asyncio import AsyncEngine
+
+from src.config import ROOT_DIR, config
+from src.database.models import Base
+from src.services.redis_service import redis_service
+
+logger = getLogger(__name__)
+
+ALEMBIC_DIR = ROOT_DIR / "src" / "alembic"
+MIGRATION_LOCK = "db-migrations"
+
+
+class SchemaError(RuntimeError):
+    pass
+
+
+def alembic_config() -> AlembicConfig:
+    alembic_cfg = AlembicConfig()
+    alembic_cfg.set_main_option("script_location", str(ALEMBIC_DIR))
+    alembic_cfg.set_main_option(
+        "sqlalchemy.url", config.DB_URL.get_secret_value().replace("%", "%%")
+    )
+    return alembic_cfg
+
+
+def head_revisions(alembic_cfg: AlembicConfig) -> set[str]:
+    return set(ScriptDirectory.from_config(alembic_cfg).get_heads())
+
+
+def _has_version_table(conn: Connection) -> bool:
+    return inspect(conn).has_table("alembic_version")
+
+
+async def current_revisions(engine: AsyncEngine) -> set[str] | None:
+    # Connection errors propagate, so an unreachable database is retried, not taken as empty
+    async with engine.connect() as conn:
+        if not await conn.run_sync(_has_version_table):
+            return None
+        result = await conn.execute(text("SELECT version_num FROM alembic_version"))
+        return set(result.scalars())
+
+
+def _upgrade(conn: Connection, alembic_cfg: AlembicConfig) -> None:
+    alembic_cfg.attributes["connection"] = conn
+    tables = set(inspect(conn).get_table_names())
+    if not tables:
+        logger.info("Empty database, creating the schema and stamping Alembic head")
+        Base.metadata.create_all(conn)
+        command.stamp(alembic_cfg, "head")
+    elif "alembic_version" not in tables:
+        # Databases created by create_all before Alembic was used have no revision yet
+        if diff := compare_metadata(MigrationContext.configure(conn), Base.metadata):
+            raise SchemaError(
+                f"Database has tables but no Alembic revision and differs from the models "
+                f"({len(diff)} changes), stamp it with `uv run migrate stamp <revision>` first"
+            )
+        logger.info("Database schema matches the models, stamping Alembic head")
+        command.stamp(alembic_cfg, "head")
+    else:
+        logger.info("Upgrading the database to Alembic head")
+        command.upgrade(alembic_cfg, "head")
+
+
+async def upgrade_database(engine: AsyncEngine) -> None:
+    alembic_cfg = alembic_config()
+    async with engine.begin() as conn:
+        await conn.run_sync(_upgrade, alembic_cfg)
+
+
+async def _wait_for_head(engine: AsyncEngine, heads: set[str]) -> None:
+    deadline = monotonic() + config.DB_MIGRATION_WAIT_SECONDS
+    while (current := await current_revisions(engine)) != heads:
+        if monotonic() > deadline:
+            raise RuntimeError(
+                f"Timed out waiting for migrations, database is at {current}, head is {heads}"
+            )
+        await asyncio.sleep(1)
+
+
+async def _migrate_as_leader(engine: AsyncEngine, heads: set[str]) -> None:
+    token = uuid.uuid4().hex
+    try:
+        leader = await redis_service.acquire_lock(
+            MIGRATION_LOCK, token, config.DB_MIGRATION_LOCK_SECONDS
+        )
+    except RedisError as e:
+        if config.APP_WORKERS != 1:
+            # Several workers migrating at once is what the lock prevents, retry until it is back
+            raise RuntimeError(f"Migration lock unavailable: {e}") from e
+        logger.warning("Migration lock unavailable, migrating as the only worker: %s", e)
+        return await upgrade_database(engine)
+
+    if not leader:
+        logger.info("Another worker is migrating the database, waiting for it")
+        return await _wait_for_head(engine, heads)
+
+    try:
+        if await current_revisions(engine) != heads:
+            await upgrade_database(engine)
+    finally:
+        await redis_service.release_lock(MIGRATION_LOCK, token)
+
+
+async def ensure_schema(engine: AsyncEngine) -> None:
+    heads = head_revisions(alembic_config())
+    current = await current_revisions(engine)
+    if current == heads:
+        logger.debug("Database is at Alembic head %s", heads)
+        return
+
+    if not config.DB_AUTO_MIGRATE:
+        raise SchemaError(
+            f"Database is at {current}, Alembic head is {heads}, "
+            "run `uv run migrate upgrade` before starting the app"
+        )
+    await _migrate_as_leader(engine, heads)
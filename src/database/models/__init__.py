@@ -5,11 +5,13 @@ from sqlalchemy.orm import DeclarativeBase
 class Base(AsyncAttrs, DeclarativeBase):
     pass
 
+from src.database.models.outbox import OutboxMessage  # noqa: E402
 from src.database.models.schedule import Schedule  # noqa: E402
 from src.database.models.user import User  # noqa: E402
 
 __all__ = [
     "Base",
+    "OutboxMessage",
     "Schedule",
     "User"
 ]
\ No newline at end of file
@@ -0,0 +1,79 @@
+import re
+from contextlib import contextmanager
+from contextvars import ContextVar
+from logging import getLogger
+from typing import Any, Iterator, Mapping
+
+from src.config import config
+
+logger = getLogger(__name__)
+
+_WHITESPACE = re.compile(r"\s+")
+_PARAM_LIST = re.compile(r"\((?:\s*(?:\?|%s|:\w+)\s*,)+\s*(?:\?|%s|:\w+)\s*\)")
+
+
+def normalize_sql(statement: str) -> str:
+    return _PARAM_LIST.sub("(...)", _WHITESPACE.sub(" ", statement).strip())
+
+
+class QueryStats:
+    def __init__(self, scope: Mapping[str, Any] | None = None):
+        self.scope = scope
+        self.count = 0
+        self.duration = 0.0
+
+    @property
+    def route(self) -> str:
+        if self.scope is None:
+            return "-"
+        # Read lazily, the route template is only in the scope once routing is done
+        route = self.scope.get("route")
+        return f"{self.scope['method']} {getattr(route, 'path', 'unmatched')}"
+
+
+query_stats: ContextVar[QueryStats | None] = ContextVar("query_stats", default=None)
+
+_recorders: list[list[str]] = []
+
+
+def record_query(statement: str, elapsed: float) -> None:
+    stats = query_stats.get()
+    if stats is not None:
+        stats.count += 1
+        stats.duration += elapsed
+
+    if elapsed * 1000 >= config.DB_SLOW_QUERY_MS:
+        logger.warning(
+            "Slow query (%.1f ms) on %s: %s",
+            elapsed * 1000, stats.route if stats else "-", normalize_sql(statement)
+        )
+
+    for recorder in _recorders:
+        recorder.append(normalize_sql(statement))
+
+
+@contextmanager
+def profile_queries(scope: Mapping[str, Any] | None = None) -> Iterator[QueryStats]:
+    stats = QueryStats(scope)
+    token = query_stats.set(stats)
+    try:
+        yield stats
+    finally:
+        query_stats.reset(token)
+
+
+@contextmanager
+def assert_max_queries(limit: int) -> Iterator[list[str]]:
+    # Records statements from every thread, so it also sees requests made through TestClient
+    statements: list[str] = []
+    _recorders.append(statements)
+    try:
+        yield statements
+    finally:
+        _recorders.remove(statements)
+
+    if len(statements) > limit:
+        listing = "\n".join(f"  {index}. {sql}" for index, sql in enumerate(statements, 1))
+        raise AssertionError(
+            f"Expected at most {limit} queries, {len(statements)} were executed:\n{listing}"
+        )
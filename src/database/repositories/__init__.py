@@ -1,7 +1,9 @@
+from src.database.repositories.outbox import OutboxRepository
 from src.database.repositories.schedule import ScheduleRepository
 from src.database.repositories.user import UserRepository
 
 __all__ = [
     "UserRepository",
-    "ScheduleRepository"
+    "ScheduleRepository",
+    "OutboxRepository"
 ]
\ No newline at end of file
@@ -0,0 +1,92 @@
+from datetime import datetime, timedelta
+from typing import Any, Sequence
+
+from sqlalchemy import delete, func, select, update
+
+from src.database import primary_session
+from src.database.models.outbox import OutboxMessage
+
+
+class OutboxRepository:
+    @staticmethod
+    async def add(queue: str, payload: dict[str, Any], session=None) -> OutboxMessage:
+        message = OutboxMessage(queue=queue, payload=payload)
+        if session is not None:
+            session.add(message)
+            return message
+
+        async with primary_session() as session:
+            session.add(message)
+            await session.commit()
+            return message
+
+    @staticmethod
+    async def get_pending(limit: int = 100) -> Sequence[OutboxMessage]:
+        async with primary_session() as session:
+            # A queue waiting for a retry is skipped entirely to keep its messages in order
+            blocked = (
+                select(OutboxMessage.queue)
+                .where(
+                    OutboxMessage.published_at.is_(None),
+                    OutboxMessage.available_at > datetime.utcnow()
+                )
+                .distinct()
+            )
+            stmt = (
+                select(OutboxMessage)
+                .where(
+                    OutboxMessage.published_at.is_(None),
+                    OutboxMessage.queue.not_in(blocked)
+                )
+                .order_by(OutboxMessage.id)
+                .limit(limit)
+            )
+            return (await session.scalars(stmt)).all()
+
+    @staticmethod
+    async def get_backlog() -> tuple[int, datetime | None]:
+        async with primary_session() as session:
+            result = await session.execute(
+                select(func.count(), func.min(OutboxMessage.created_at))
+                .where(OutboxMessage.published_at.is_(None))
+            )
+            count, oldest = result.one()
+            return count, oldest
+
+    @staticmethod
+    async def mark_published(ids: Sequence[int]) -> None:
+        if not ids:
+            return
+        async with primary_session() as session:
+            await session.execute(
+                update(OutboxMessage)
+                .where(OutboxMessage.id.in_(ids))
+                .values(published_at=datetime.utcnow())
+            )
+            await session.commit()
+
+    @staticmethod
+    async def mark_failed(id: int, error: str, retry_in: float) -> None:
+        async with primary_session() as session:
+            await session.execute(
+                update(OutboxMessage)
+                .where(OutboxMessage.id == id)
+                .values(
+                    attempts=OutboxMessage.attempts + 1,
+                    last_error=error,
+                    available_at=datetime.utcnow() + timedelta(seconds=retry_in)
+                )
+            )
+            await session.commit()
+
+    @staticmethod
+    async def delete_published(older_than: datetime) -> int:
+        async with primary_session() as session:
+            result = await session.execute(
+                delete(OutboxMessage).where(
+                    OutboxMessage.published_at.is_not(None),
+                    OutboxMessage.published_at < older_than
+                )
+            )
+            await session.commit()
+            return result.rowcount or 0
@@ -1,45 +1,44 @@
-from sqlalchemy import select
-from sqlalchemy.exc import IntegrityError
+from sqlalchemy import bindparam, select
 
-from src.database import async_session
+from src.database import async_session, primary_session
 from src.database.models.schedule import Schedule
+from src.database.unit_of_work import commit, savepoint, session_scope
 from src.schemas.schedule import ScheduleCreate, ScheduleUpdate
 
+_SCHEDULE_BY_ID = select(Schedule).where(Schedule.id == bindparam("id"))
+
 
 class ScheduleRepository:
     @staticmethod
     async def get_schedule(id: int = 1) -> Schedule | None:
-        async with async_session() as session:
-            return await session.scalar(select(Schedule).where(Schedule.id == id)) or None
+        async with session_scope(async_session) as session:
+            return await session.scalar(_SCHEDULE_BY_ID, {"id": id}) or None
 
     @staticmethod
     async def create_schedule(schedule_data: ScheduleCreate) -> Schedule:
-        async with async_session() as session:
-            try:
+        async with session_scope(primary_session) as session:
+            async with savepoint(session):
                 session.add(schedule := Schedule(**schedule_data.model_dump()))
-                await session.commit()
-                await session.refresh(schedule)
-                return schedule
-            except IntegrityError:
-                await session.rollback()
-                raise
+                await commit(session)
+            await session.refresh(schedule)
+            return schedule
 
     @staticmethod
     async def update_schedule(id: int, schedule_data: ScheduleUpdate) -> Schedule | None:
-        async with async_session() as session:
-            if not (schedule := await session.scalar(select(Schedule).where(Schedule.id == id))):
+        async with session_scope(primary_session) as session:
+            if not (schedule := await session.scalar(_SCHEDULE_BY_ID, {"id": id})):
                 return None
             for key, value in schedule_data.model_dump(exclude_unset=True).items():
                 setattr(schedule, key, value)
-            await session.commit()
+            await commit(session)
             await session.refresh(schedule)
             return schedule
         
     @staticmethod
     async def delete_schedule(id: int) -> bool:
-        async with async_session() as session:
-            if not (schedule := await session.scalar(select(Schedule).where(Schedule.id == id))):
+        async with session_scope(primary_session) as session:
+            if not (schedule := await session.scalar(_SCHEDULE_BY_ID, {"id": id})):
                 return False
             await session.delete(schedule)
-            await session.commit()
+            await commit(session)
             return True
\ No newline at end of file
@@ -1,61 +1,105 @@
-from typing import Sequence
+from functools import lru_cache
+from typing import Any, Sequence
 
-from sqlalchemy import and_, select
-from sqlalchemy.exc import IntegrityError
+from sqlalchemy import Row, Select, bindparam, select
 
-from src.database import async_session
+from src.database import async_session, primary_session
 from src.database.models.user import User
+from src.database.unit_of_work import commit, savepoint, session_scope
 from src.schemas.user import UserCreate, UserRole, UserUpdate
 
+_USER_BY_TG = select(User).where(User.tg_id == bindparam("tg_id"))
+
 
 async def _get_by_tg(session, tg_id: int) -> User | None:
-    return await session.scalar(select(User).where(User.tg_id == tg_id)) or None
+    return await session.scalar(_USER_BY_TG, {"tg_id": tg_id}) or None
+
+
+@lru_cache(maxsize=128)
+def _select_user(fields: tuple[str, ...] | None = None, admins_only: bool = False) -> Select:
+    if fields:
+        stmt = select(*(getattr(User, field) for field in fields))
+    else:
+        stmt = select(User)
+    return stmt.where(User.role == UserRole.admin) if admins_only else stmt
+
+
+@lru_cache(maxsize=128)
+def _user_by_id(fields: tuple[str, ...] | None, admins_only: bool) -> Select:
+    return _select_user(fields, admins_only).where(User.id == bindparam("id"))
+
+
+@lru_cache(maxsize=128)
+def _users_page(fields: tuple[str, ...] | None, admins_only: bool) -> Select:
+    return _select_user(fields, admins_only).offset(bindparam("offset")).limit(bindparam("limit"))
+
+
+def _fields_key(fields: Sequence[str] | None) -> tuple[str, ...] | None:
+    return tuple(fields) if fields else None
+
+
+async def _fetch_one(
+    session, stmt: Select, params: dict[str, Any], fields: Sequence[str] | None
+) -> User | Row | None:
+    if fields:
+        return (await session.execute(stmt, params)).first()
+    return await session.scalar(stmt, params) or None
+
+
+async def _fetch_all(
+    session, stmt: Select, params: dict[str, Any], fields: Sequence[str] | None
+) -> Sequence[User] | Sequence[Row]:
+    if fields:
+        return (await session.execute(stmt, params)).all()
+    return (await session.scalars(stmt, params)).all()
 
 
 class UserRepository:
     @staticmethod
-    async def get_admin_by_id(id: int) -> User | None:
-        async with async_session() as session:
-            return await session.scalar(
-                select(User).where(and_(User.id == id, User.role == UserRole.admin))
-            ) or None
+    async def get_admin_by_id(id: int, fields: Sequence[str] | None = None) -> User | Row | None:
+        async with session_scope(async_session) as session:
+            stmt = _user_by_id(_fields_key(fields), True)
+            return await _fetch_one(session, stmt, {"id": id}, fields)
 
     @staticmethod
-    async def get_user_by_id(id: int) -> User | None:
-        async with async_session() as session:
-            return await session.scalar(select(User).where(User.id == id)) or None
+    async def get_user_by_id(id: int, fields: Sequence[str] | None = None) -> User | Row | None:
+        async with session_scope(async_session) as session:
+            stmt = _user_by_id(_fields_key(fields), False)
+            return await _fetch_one(session, stmt, {"id": id}, fields)
 
     @staticmethod
     async def get_user(tg_id: int) -> User | None:
-        async with async_session() as session:
+        async with session_scope(async_session) as session:
             return await _get_by_tg(session, tg_id)
 
     @staticmethod
-    async def get_users(limit: int = 100, offset: int = 0) -> Sequence[User]:
-        async with async_session() as session:
-            return (await session.scalars(select(User).offset(offset).limit(limit))).all()
+    async def get_users(
+        limit: int = 100, offset: int = 0, fields: Sequence[str] | None = None
+    ) -> Sequence[User] | Sequence[Row]:
+        async with session_scope(async_session) as session:
+            stmt = _users_page(_fields_key(fields), False)
+            return await _fetch_all(session, stmt, {"offset": offset, "limit": limit}, fields)
 
     @staticmethod
-    async def get_admins(limit: int = 100, offset: int = 0) -> Sequence[User]:
-        async with async_session() as session:
-            stmt = select(User).where(User.role == UserRole.admin).offset(offset).limit(limit)
-            return (await session.scalars(stmt)).all()
+    async def get_admins(
+        limit: int = 100, offset: int = 0, fields: Sequence[str] | None = None
+    ) -> Sequence[User] | Sequence[Row]:
+        async with session_scope(async_session) as session:
+            stmt = _users_page(_fields_key(fields), True)
+            return await _fetch_all(session, stmt, {"offset": offset, "limit": limit}, fields)
 
     @staticmethod
     async def create_user(user_data: UserCreate) -> User:
-        async with async_session() as session:
-            try:
+        async with session_scope(primary_session) as session:
+            async with savepoint(session):
                 session.add(user := User(**user_data.model_dump()))
-                await session.commit()
-                await session.refresh(user)
-                return user
-            except IntegrityError:
-                await session.rollback()
-                raise
+                await commit(session)
+            await session.refresh(user)
+            return user
 
     @staticmethod
     async def update_user(tg_id: int, data: UserUpdate) -> User | None:
-        async with async_session() as session:
+        async with session_scope(primary_session) as session:
             if not (user := await _get_by_tg(session, tg_id)):
                 return None
 
@@ -63,45 +107,45 @@ class UserRepository:
             for key, value in update_data.items():
                 setattr(user, key, value)
 
-            await session.commit()
+            await commit(session)
             await session.refresh(user)
             return user
 
     @staticmethod
     async def set_privacy_policy(tg_id: int, accepted: bool) -> User | None:
-        async with async_session() as session:
+        async with session_scope(primary_session) as session:
             if not (user := await _get_by_tg(session, tg_id)):
                 return None
             user.accepted_privacy_policy = accepted
-            await session.commit()
+            await commit(session)
             await session.refresh(user)
             return user
         
     @staticmethod
     async def set_not_new(tg_id: int) -> User | None:
-        async with async_session() as session:
+        async with session_scope(primary_session) as session:
             if not (user := await _get_by_tg(session, tg_id)):
                 return None
             user.is_new = False
-            await session.commit()
+            await commit(session)
             await session.refresh(user)
             return user
 
     @staticmethod
     async def delete_user(tg_id: int) -> bool:
-        async with async_session() as session:
+        async with session_scope(primary_session) as session:
             if not (user := await _get_by_tg(session, tg_id)):
                 return False
             await session.delete(user)
-            await session.commit()
+            await commit(session)
             return True
 
     @staticmethod
     async def set_role(tg_id: int, role: UserRole) -> User | None:
-        async with async_session() as session:
+        async with session_scope(primary_session) as session:
             if not (user := await _get_by_tg(session, tg_id)):
                 return None
             user.role = role
-            await session.commit()
+            await commit(session)
             await session.refresh(user)
             return user
\ No newline at end of file
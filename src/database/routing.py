@@ -0,0 +1,42 @@
+from contextvars import ContextVar
+from typing import Any
+
+from sqlalchemy import Select, event
+from sqlalchemy.ext.asyncio import AsyncEngine
+from sqlalchemy.orm import Session
+
+
+class ReadYourWrites:
+    def __init__(self):
+        self.wrote = False
+
+
+read_your_writes: ContextVar[ReadYourWrites | None] = ContextVar("read_your_writes", default=None)
+
+
+class RoutingSession(Session):
+    def __init__(self, *args: Any, replica: AsyncEngine | None = None, **kwargs: Any):
+        super().__init__(*args, **kwargs)
+        self.replica = replica.sync_engine if replica else None
+
+    def get_bind(self, mapper=None, clause=None, **kwargs):
+        if self._use_replica(clause):
+            return self.replica
+        return super().get_bind(mapper=mapper, clause=clause, **kwargs)
+
+    def _use_replica(self, clause) -> bool:
+        if self.replica is None or self.info.get("wrote"):
+            return False
+        # Locking reads opt out with select(...).execution_options(use_primary=True)
+        if not isinstance(clause, Select) or clause.get_execution_options().get("use_primary"):
+            return False
+        state = read_your_writes.get()
+        return not (state and state.wrote)
+
+
+# Fires before the flush emits anything, so selects issued during the flush stay on the primary
+@event.listens_for(Session, "before_flush")
+def _mark_written(session: Session, flush_context, instances) -> None:
+    session.info["wrote"] = True
+    if state := read_your_writes.get():
+        state.wrote = True
@@ -0,0 +1,62 @@
+from contextlib import asynccontextmanager
+from contextvars import ContextVar
+from typing import AsyncIterator
+
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
+
+from src.database.base import primary_session
+from src.utils.server_timing import timed
+
+current_session: ContextVar[AsyncSession | None] = ContextVar("current_session", default=None)
+
+
+@asynccontextmanager
+async def unit_of_work() -> AsyncIterator[AsyncSession]:
+    if (session := current_session.get()) is not None:
+        yield session
+        return
+
+    async with primary_session() as session:
+        token = current_session.set(session)
+        try:
+            yield session
+            with timed("db"):
+                await session.commit()
+        except BaseException:
+            await session.rollback()
+            raise
+        finally:
+            current_session.reset(token)
+
+
+@asynccontextmanager
+async def session_scope(factory: async_sessionmaker[AsyncSession]) -> AsyncIterator[AsyncSession]:
+    with timed("db"):
+        if (session := current_session.get()) is not None:
+            yield session
+            return
+
+        async with factory() as session:
+            yield session
+
+
+@asynccontextmanager
+async def savepoint(session: AsyncSession) -> AsyncIterator[None]:
+    # Inside a unit of work a failed write only undoes itself, not the whole request
+    if session is current_session.get():
+        async with session.begin_nested():
+            yield
+        return
+
+    try:
+        yield
+    except BaseException:
+        await session.rollback()
+        raise
+
+
+async def commit(session: AsyncSession) -> None:
+    if session is current_session.get():
+        await session.flush()
+    else:
+        await session.commit()
@@ -0,0 +1,61 @@
+import asyncio
+import random
+from logging import getLogger
+
+from aiogram.utils.web_app import safe_parse_webapp_init_data
+from starlette.datastructures import Headers, MutableHeaders
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from src.config import config
+from src.services.user_service import user_service
+from src.utils.cpu_profiler import SamplingProfiler, active_profiler, profile_store
+
+logger = getLogger(__name__)
+
+
+async def _is_admin(init_data: str | None) -> bool:
+    if not init_data:
+        return False
+    try:
+        data = safe_parse_webapp_init_data(config.TOKEN_BOT.get_secret_value(), init_data)
+    except ValueError:
+        return False
+    return bool(data.user) and await user_service.is_admin(data.user.id)
+
+
+class ProfilerMiddleware:
+    def __init__(self, app: ASGIApp):
+        self.app = app
+        self.request_header = config.PROFILE_HEADER.lower()
+
+    async def should_profile(self, scope: Scope) -> bool:
+        headers = Headers(scope=scope)
+        if self.request_header in headers:
+            return await _is_admin(headers.get("initdata"))
+        return config.PROFILE_SAMPLE_RATE > 0 and random.random() < config.PROFILE_SAMPLE_RATE
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send):
+        if scope["type"] != "http" or not await self.should_profile(scope):
+            return await self.app(scope, receive, send)
+
+        profiler = SamplingProfiler(
+            f"{scope['method']} {scope['path']}", config.PROFILE_INTERVAL_MS / 1000
+        )
+
+        async def send_wrapper(message: Message):
+            if message["type"] == "http.response.start":
+                MutableHeaders(scope=message).append("X-Profile-Id", profiler.profile_id)
+            await send(message)
+
+        token = active_profiler.set(profiler)
+        profiler.start()
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            profiler.stop()
+            active_profiler.reset(token)
+            try:
+                await asyncio.to_thread(profile_store.save, profiler)
+            except Exception as e:
+                # The response is already sent, a full disk must not turn it into an error
+                logger.error("Failed to save CPU profile %s: %s", profiler.profile_id, e)
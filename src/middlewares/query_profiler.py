@@ -0,0 +1,32 @@
+from logging import getLogger
+
+from starlette.types import ASGIApp, Receive, Scope, Send
+
+from src.config import config
+from src.database.profiler import profile_queries
+
+logger = getLogger(__name__)
+
+
+class QueryProfilerMiddleware:
+    def __init__(self, app: ASGIApp):
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send):
+        if scope["type"] != "http":
+            return await self.app(scope, receive, send)
+
+        with profile_queries(scope) as stats:
+            try:
+                await self.app(scope, receive, send)
+            finally:
+                if stats.count > config.DB_QUERY_COUNT_WARN:
+                    logger.warning(
+                        "%s executed %s queries in %.1f ms",
+                        stats.route, stats.count, stats.duration * 1000
+                    )
+                elif stats.count:
+                    logger.debug(
+                        "%s executed %s queries in %.1f ms",
+                        stats.route, stats.count, stats.duration * 1000
+                    )
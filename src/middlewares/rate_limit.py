@@ -6,8 +6,20 @@ from starlette.middleware.base import BaseHTTPMiddleware
 from src.config import config
 from src.services.redis_service import redis_service
 from src.utils.exceptions import too_many_requests_error
+from src.utils.metrics import RATE_LIMIT_VERDICTS
+from src.utils.server_timing import timed
 
-IGNORED_PATHS = {"/", "/versions", "/docs", "/openapi.json", "/favicon.ico"}
+IGNORED_PATHS = {
+    "/",
+    "/versions",
+    "/docs",
+    "/openapi.json",
+    "/favicon.ico",
+    "/metrics",
+    "/health/live",
+    "/health/ready",
+    "/v1/webhooks/twitch/callback",
+}
 
 
 class RateLimitMiddleware(BaseHTTPMiddleware):
@@ -19,13 +31,23 @@ class RateLimitMiddleware(BaseHTTPMiddleware):
 
     async def dispatch(self, request: Request, call_next):
         if request.url.path in IGNORED_PATHS:
+            RATE_LIMIT_VERDICTS.labels("ignored").inc()
             return await call_next(request)
 
+        with timed("ratelimit"):
+            verdict = await self.check(request)
+        if verdict:
+            return verdict
+        RATE_LIMIT_VERDICTS.labels("allowed").inc()
+        return await call_next(request)
+
+    async def check(self, request: Request):
         ip = request.client.host if request.client else "127.0.1.1"
         now = int(time())
         ban_until = await redis_service.get_ban(ip)
         
         if ban_until and ban_until > now:
+            RATE_LIMIT_VERDICTS.labels("banned").inc()
             return too_many_requests_error(
                 f"You are banned for {ban_until - now} more seconds",
             )
@@ -35,7 +57,8 @@ class RateLimitMiddleware(BaseHTTPMiddleware):
         if count + 1 > self.max_requests:
             await redis_service.ban_ip(ip, self.ban_seconds)
             await redis_service.clear_requests(ip)
+            RATE_LIMIT_VERDICTS.labels("limited").inc()
             return too_many_requests_error(
                 f"Rate limit exceeded. You are banned for {self.ban_seconds // 60} minutes.",
             )
-        return await call_next(request)
+        return None
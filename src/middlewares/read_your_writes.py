@@ -0,0 +1,18 @@
+from starlette.types import ASGIApp, Receive, Scope, Send
+
+from src.database.routing import ReadYourWrites, read_your_writes
+
+
+class ReadYourWritesMiddleware:
+    def __init__(self, app: ASGIApp):
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send):
+        if scope["type"] != "http":
+            return await self.app(scope, receive, send)
+
+        token = read_your_writes.set(ReadYourWrites())
+        try:
+            await self.app(scope, receive, send)
+        finally:
+            read_your_writes.reset(token)
@@ -0,0 +1,36 @@
+from starlette.datastructures import Headers, MutableHeaders
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from src.config import config
+from src.utils.server_timing import ServerTiming, server_timing
+
+
+class ServerTimingMiddleware:
+    def __init__(self, app: ASGIApp):
+        self.app = app
+        self.request_header = config.SERVER_TIMING_HEADER.lower()
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send):
+        if scope["type"] != "http":
+            return await self.app(scope, receive, send)
+
+        # Without the global switch timings are only collected when asked for,
+        # and only sent back once auth has seen an admin
+        requested = self.request_header in Headers(scope=scope)
+        if not config.SERVER_TIMING_ENABLED and not requested:
+            return await self.app(scope, receive, send)
+
+        timing = ServerTiming(enabled=config.SERVER_TIMING_ENABLED)
+
+        async def send_wrapper(message: Message):
+            if message["type"] == "http.response.start" and timing.enabled:
+                headers = MutableHeaders(scope=message)
+                headers.append("Server-Timing", timing.header())
+                headers.append("Timing-Allow-Origin", "*")
+            await send(message)
+
+        token = server_timing.set(timing)
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            server_timing.reset(token)
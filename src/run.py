@@ -1,32 +1,69 @@
+import os
+import shutil
 from logging import getLogger
 
 import uvicorn
 
-from src.config import config
+from src.config import LOGS_DIR, config
 from src.utils.logger import setup_logging
 
 logger = getLogger(__name__)
 
 
+def _worker_count() -> int:
+    if config.APP_RELOAD:
+        return 1
+    return config.APP_WORKERS if config.APP_WORKERS > 0 else os.cpu_count() or 1
+
+
+def _prepare_metrics_dir(workers: int) -> None:
+    # Workers are separate processes, Prometheus needs a shared directory to sum them up
+    if workers == 1 or os.environ.get("PROMETHEUS_MULTIPROC_DIR"):
+        return
+    metrics_dir = LOGS_DIR / "prometheus"
+    shutil.rmtree(metrics_dir, ignore_errors=True)
+    metrics_dir.mkdir(parents=True)
+    os.environ["PROMETHEUS_MULTIPROC_DIR"] = str(metrics_dir)
+
+
+def _prepare_worker_logs(workers: int) -> None:
+    # Workers appending to one file would race on rotation, each gets app.<pid>.log instead
+    if workers > 1:
+        os.environ["LOG_PER_PROCESS"] = "true"
+
+
 def start() -> None:
     setup_logging()
-    
+
     try:
+        workers = _worker_count()
+        _prepare_metrics_dir(workers)
+        _prepare_worker_logs(workers)
+
         logger.info("Starting backend server...")
-        logger.info(f"Host: {config.APP_HOST}, Port: {config.APP_PORT}")
-        logger.info(f"Reload mode: {config.APP_RELOAD}")
+        logger.info("Host: %s, Port: %s", config.APP_HOST, config.APP_PORT)
+        logger.info("Reload mode: %s", config.APP_RELOAD)
+        logger.info(
+            "Workers: %s, loop: %s, http: %s", workers, config.APP_LOOP, config.APP_HTTP
+        )
         logger.info("Server is starting...")
-        
+
         uvicorn.run(
-            "src.app:app", 
-            host=config.APP_HOST, 
-            port=config.APP_PORT, 
+            "src.app:app",
+            host=config.APP_HOST,
+            port=config.APP_PORT,
             reload=config.APP_RELOAD,
+            workers=workers,
+            loop=config.APP_LOOP,
+            http=config.APP_HTTP,
+            backlog=config.APP_BACKLOG,
+            timeout_keep_alive=config.APP_KEEPALIVE_SECONDS,
+            limit_concurrency=config.APP_LIMIT_CONCURRENCY,
             log_config=None,
             access_log=True,
         )
     except Exception as e:
-        logger.error(f"Error starting server: {e}")
+        logger.error("Error starting server: %s", e)
         logger.info("Backend terminated with an error")
         raise
     finally:
@@ -34,4 +71,4 @@ def start() -> None:
 
 
 if __name__ == "__main__":
-    start()
\ No newline at end of file
+    start()
@@ -1,13 +1,15 @@
 from __future__ import annotations
 
 from datetime import datetime
-from typing import TYPE_CHECKING, Optional
+from typing import TYPE_CHECKING, Any, Optional, Sequence
 
 from pydantic import BaseModel, Field
 
 from src.schemas.roles import UserRole
 
 if TYPE_CHECKING:
+    from sqlalchemy import Row
+
     from src.database.models.user import User
 
 
@@ -87,3 +89,32 @@ class UserSchema(UserRead):
             created_at=user.created_at,
             updated_at=user.updated_at
         )
+
+    @classmethod
+    def dump(
+        cls,
+        user: Optional[User | Row],
+        fields: Optional[Sequence[str]] = None
+    ) -> Optional[dict[str, Any]]:
+        if user is None:
+            return None
+        if not fields:
+            schema = cls.from_models(user)  # type: ignore[arg-type]
+            return schema.model_dump(mode="json") if schema else None
+        values = {field: getattr(user, field) for field in fields}
+        return cls.model_construct(**values).model_dump(mode="json", include=set(fields))
+
+
+USER_FIELDS: tuple[str, ...] = tuple(UserSchema.model_fields)
+
+
+def parse_user_fields(fields: Optional[str]) -> Optional[tuple[str, ...]]:
+    if not fields:
+        return None
+    selected = tuple(dict.fromkeys(part.strip() for part in fields.split(",") if part.strip()))
+    unknown = [field for field in selected if field not in USER_FIELDS]
+    if unknown:
+        raise ValueError(
+            f"Unknown fields: {', '.join(unknown)}. Allowed fields: {', '.join(USER_FIELDS)}"
+        )
+    return selected or None
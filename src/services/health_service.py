@@ -0,0 +1,104 @@
+import asyncio
+from logging import getLogger
+from time import monotonic
+from typing import Any, Awaitable, Callable
+
+from sqlalchemy import text
+
+from src.config import config
+from src.database.base import engine
+from src.services.redis_service import redis_service
+
+logger = getLogger(__name__)
+
+StartupStep = Callable[[], Awaitable[None]]
+
+
+class HealthService:
+    def __init__(self):
+        self.cache_seconds = config.HEALTH_CACHE_SECONDS
+        self.check_timeout = config.HEALTH_CHECK_TIMEOUT_SECONDS
+        self.retry_base = config.STARTUP_RETRY_BASE_SECONDS
+        self.retry_max = config.STARTUP_RETRY_MAX_SECONDS
+
+        self.started: set[str] = set()
+        self._tasks: list[asyncio.Task] = []
+        self._lock = asyncio.Lock()
+        self._checked_at = 0.0
+        self._report: dict[str, Any] | None = None
+
+    def start(
+        self, steps: dict[str, StartupStep], fatal: tuple[type[Exception], ...] = ()
+    ) -> None:
+        self._tasks = [
+            asyncio.create_task(self._run_step(name, step, fatal), name=f"startup-{name}")
+            for name, step in steps.items()
+        ]
+
+    async def stop(self) -> None:
+        for task in self._tasks:
+            task.cancel()
+        await asyncio.gather(*self._tasks, return_exceptions=True)
+        self._tasks = []
+
+    def is_started(self, name: str) -> bool:
+        return name in self.started
+
+    async def _run_step(
+        self, name: str, step: StartupStep, fatal: tuple[type[Exception], ...]
+    ) -> None:
+        failures = 0
+        while True:
+            try:
+                await step()
+            except fatal as e:
+                # Retrying cannot fix these, the app stays unready until an operator steps in
+                logger.critical("Startup step '%s' failed and will not be retried: %s", name, e)
+                return
+            except Exception as e:
+                failures += 1
+                delay = min(self.retry_max, self.retry_base * 2 ** (failures - 1))
+                logger.warning(
+                    "Startup step '%s' failed (%s), retrying in %.0fs", name, e, delay
+                )
+                await asyncio.sleep(delay)
+                continue
+
+            self.started.add(name)
+            logger.info("Startup step '%s' finished", name)
+            return
+
+    async def readiness(self) -> dict[str, Any]:
+        # Probes share one cached result, so hammering the endpoint never reaches the backends
+        async with self._lock:
+            if self._report is None or monotonic() - self._checked_at >= self.cache_seconds:
+                self._report = await self._check()
+                self._checked_at = monotonic()
+            return self._report
+
+    async def _check(self) -> dict[str, Any]:
+        database, redis = await asyncio.gather(
+            self._probe(self._check_database()), self._probe(redis_service.ping())
+        )
+        checks = {
+            "database": database and self.is_started("database"),
+            "redis": redis,
+            "twitch": self.is_started("twitch"),
+        }
+        return {"ready": all(checks.values()), "checks": checks}
+
+    async def _probe(self, check: Awaitable[Any]) -> bool:
+        try:
+            await asyncio.wait_for(check, self.check_timeout)
+            return True
+        except Exception as e:
+            logger.debug("Readiness probe failed: %s", e)
+            return False
+
+    @staticmethod
+    async def _check_database() -> None:
+        async with engine.connect() as connection:
+            await connection.execute(text("SELECT 1"))
+
+
+health_service = HealthService()
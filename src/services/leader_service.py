@@ -0,0 +1,61 @@
+import asyncio
+import uuid
+from logging import getLogger
+
+from src.config import config
+from src.services.redis_service import redis_service
+
+logger = getLogger(__name__)
+
+LEADER_LOCK = "leader"
+
+
+class LeaderService:
+    def __init__(
+        self,
+        ttl: int = config.LEADER_LOCK_SECONDS,
+        renew_interval: float = config.LEADER_RENEW_SECONDS
+    ):
+        self.ttl = ttl
+        self.renew_interval = renew_interval
+        self.token = uuid.uuid4().hex
+        self.is_leader = False
+        self._task: asyncio.Task | None = None
+
+    async def start(self) -> None:
+        if self._task:
+            return
+        self._task = asyncio.create_task(self._run(), name="leader-election")
+
+    async def stop(self) -> None:
+        if not self._task:
+            return
+        self._task.cancel()
+        await asyncio.gather(self._task, return_exceptions=True)
+        self._task = None
+        if self.is_leader:
+            self.is_leader = False
+            try:
+                # Lets another worker take over right away instead of waiting for the TTL
+                await redis_service.release_lock(LEADER_LOCK, self.token)
+            except Exception as e:
+                logger.warning("Failed to release the leader lock: %s", e)
+
+    async def _run(self) -> None:
+        while True:
+            try:
+                held = await redis_service.hold_lock(LEADER_LOCK, self.token, self.ttl)
+            except Exception as e:
+                # Without Redis nobody can prove leadership, so singleton jobs pause everywhere
+                logger.warning("Leader lock unavailable: %s", e)
+                held = False
+
+            if held != self.is_leader:
+                logger.info(
+                    "This worker is now the leader" if held else "This worker lost leadership"
+                )
+            self.is_leader = held
+            await asyncio.sleep(self.renew_interval)
+
+
+leader_service = LeaderService()
@@ -0,0 +1,80 @@
+import asyncio
+import sys
+import threading
+import traceback
+from logging import getLogger
+from time import perf_counter
+
+from src.config import config
+from src.utils.metrics import EVENT_LOOP_LAG, EVENT_LOOP_STALLS
+
+logger = getLogger(__name__)
+
+
+class LoopMonitor:
+    def __init__(self):
+        self.interval = config.LOOP_MONITOR_INTERVAL_SECONDS
+        self.threshold = config.LOOP_LAG_THRESHOLD_MS / 1000
+        self._loop: asyncio.AbstractEventLoop | None = None
+        self._loop_thread_id = 0
+        self._watchdog: threading.Thread | None = None
+        self._stopped = threading.Event()
+
+    async def start(self) -> None:
+        if self._watchdog:
+            return
+
+        self._loop = asyncio.get_running_loop()
+        if config.ASYNCIO_DEBUG:
+            self._loop.set_debug(True)
+            self._loop.slow_callback_duration = self.threshold
+            logger.warning("asyncio debug mode is on, expect slower request handling")
+
+        if not config.LOOP_MONITOR_ENABLED:
+            return
+
+        self._loop_thread_id = threading.get_ident()
+        self._stopped.clear()
+        self._watchdog = threading.Thread(target=self._watch, name="loop-watchdog", daemon=True)
+        self._watchdog.start()
+        logger.debug("Event loop monitor started")
+
+    async def stop(self) -> None:
+        if not self._watchdog:
+            return
+        self._stopped.set()
+        await asyncio.to_thread(self._watchdog.join)
+        self._watchdog = None
+        logger.debug("Event loop monitor stopped")
+
+    def _watch(self) -> None:
+        # Probes the loop from outside, so a stall is caught while the blocking code still runs
+        while not self._stopped.wait(self.interval):
+            answered = threading.Event()
+            sent = perf_counter()
+            try:
+                self._loop.call_soon_threadsafe(answered.set)  # type: ignore[union-attr]
+            except RuntimeError:
+                return
+
+            if not answered.wait(self.threshold):
+                self._report_stall()
+                while not answered.wait(self.interval):
+                    if self._stopped.is_set():
+                        return
+                logger.warning(
+                    "Event loop was blocked for %.0f ms", (perf_counter() - sent) * 1000
+                )
+            EVENT_LOOP_LAG.observe(perf_counter() - sent)
+
+    def _report_stall(self) -> None:
+        EVENT_LOOP_STALLS.inc()
+        frame = sys._current_frames().get(self._loop_thread_id)
+        stack = "".join(traceback.format_stack(frame)) if frame else "<no frame>\n"
+        logger.warning(
+            "Event loop has not responded for %.0f ms, loop thread is at:\n%s",
+            self.threshold * 1000, stack
+        )
+
+
+loop_monitor = LoopMonitor()
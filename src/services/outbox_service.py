@@ -0,0 +1,160 @@
+import asyncio
+from datetime import datetime, timedelta, timezone
+from logging import getLogger
+from typing import Any, Awaitable, Callable, Protocol
+
+from src.config import config
+from src.database.models.outbox import OutboxMessage
+from src.database.repositories.outbox import OutboxRepository
+from src.services.leader_service import leader_service
+from src.utils.metrics import (
+    BROKER_PUBLISH_ERRORS,
+    BROKER_PUBLISH_LATENCY,
+    OUTBOX_LAG,
+    OUTBOX_PENDING,
+    observe,
+)
+
+logger = getLogger(__name__)
+
+
+class Publisher(Protocol):
+    async def publish(self, message: Any, queue: str) -> Any: ...
+
+
+Preparer = Callable[[dict[str, Any]], Awaitable[dict[str, Any]]]
+
+
+class OutboxRelay:
+    def __init__(
+        self,
+        batch_size: int = config.OUTBOX_BATCH_SIZE,
+        poll_interval: float = config.OUTBOX_POLL_INTERVAL_SECONDS,
+        retry_base: float = config.OUTBOX_RETRY_BASE_SECONDS,
+        retry_max: float = config.OUTBOX_RETRY_MAX_SECONDS
+    ):
+        self.batch_size = batch_size
+        self.poll_interval = poll_interval
+        self.retry_base = retry_base
+        self.retry_max = retry_max
+
+        self.publisher: Publisher | None = None
+        self.preparers: dict[str, Preparer] = {}
+        self._wakeup = asyncio.Event()
+        self._task: asyncio.Task | None = None
+
+        self.published = 0
+        self.failed = 0
+
+    async def enqueue(self, queue: str, payload: dict[str, Any], session=None) -> OutboxMessage:
+        message = await OutboxRepository.add(queue, payload, session)
+        if session is None:
+            self.notify()
+        return message
+
+    def register_preparer(self, queue: str, preparer: Preparer) -> None:
+        # Turns a stored payload into the published message, a failure is retried like a publish
+        self.preparers[queue] = preparer
+
+    def notify(self) -> None:
+        self._wakeup.set()
+
+    async def start(self, publisher: Publisher) -> None:
+        if self._task:
+            return
+        self.publisher = publisher
+        self._wakeup = asyncio.Event()
+        self._task = asyncio.create_task(self._run(), name="outbox-relay")
+        logger.debug("Outbox relay started")
+
+    async def stop(self) -> None:
+        if not self._task:
+            return
+        self._task.cancel()
+        await asyncio.gather(self._task, return_exceptions=True)
+        self._task = None
+        logger.debug("Outbox relay stopped")
+
+    async def relay_once(self) -> int:
+        assert self.publisher is not None
+        messages = await OutboxRepository.get_pending(self.batch_size)
+        if not messages:
+            return 0
+
+        by_queue: dict[str, list[OutboxMessage]] = {}
+        for message in messages:
+            by_queue.setdefault(message.queue, []).append(message)
+
+        results = await asyncio.gather(
+            *(self._publish_queue(queue_messages) for queue_messages in by_queue.values())
+        )
+        published_ids = [id for ids in results for id in ids]
+        await OutboxRepository.mark_published(published_ids)
+        self.published += len(published_ids)
+        return len(messages)
+
+    async def update_backlog(self) -> None:
+        pending, oldest = await OutboxRepository.get_backlog()
+        if oldest and oldest.tzinfo:
+            oldest = oldest.astimezone(timezone.utc).replace(tzinfo=None)
+        OUTBOX_PENDING.set(pending)
+        OUTBOX_LAG.set((datetime.utcnow() - oldest).total_seconds() if oldest else 0)
+
+    async def cleanup(self) -> None:
+        older_than = datetime.utcnow() - timedelta(hours=config.OUTBOX_RETENTION_HOURS)
+        deleted = await OutboxRepository.delete_published(older_than)
+        logger.debug("Deleted %s published outbox messages", deleted)
+
+    def stats(self) -> dict[str, Any]:
+        return {
+            "running": self._task is not None,
+            "leader": leader_service.is_leader,
+            "published": self.published,
+            "failed": self.failed,
+        }
+
+    async def _publish_queue(self, messages: list[OutboxMessage]) -> list[int]:
+        assert self.publisher is not None
+        published: list[int] = []
+        for message in messages:
+            try:
+                payload = message.payload
+                if preparer := self.preparers.get(message.queue):
+                    payload = await preparer(payload)
+                with observe(BROKER_PUBLISH_LATENCY, BROKER_PUBLISH_ERRORS, message.queue):
+                    await self.publisher.publish(payload, queue=message.queue)
+            except Exception as e:
+                # Stop at the first failure so the rest of this queue keeps its order
+                self.failed += 1
+                retry_in = min(self.retry_max, self.retry_base * 2 ** message.attempts)
+                logger.warning(
+                    "Failed to publish outbox message %s to '%s' (attempt %s): %s, "
+                    "retrying in %.0fs",
+                    message.id, message.queue, message.attempts + 1, e, retry_in
+                )
+                await OutboxRepository.mark_failed(message.id, str(e), retry_in)
+                break
+            published.append(message.id)
+        return published
+
+    async def _run(self) -> None:
+        while True:
+            relayed = 0
+            # Only the leader reads pending rows, two relays would publish them twice
+            if leader_service.is_leader:
+                try:
+                    relayed = await self.relay_once()
+                    await self.update_backlog()
+                except Exception as e:
+                    logger.error("⚠️ Outbox relay iteration failed: %s", e)
+
+            if relayed >= self.batch_size:
+                continue
+            self._wakeup.clear()
+            try:
+                await asyncio.wait_for(self._wakeup.wait(), timeout=self.poll_interval)
+            except asyncio.TimeoutError:
+                pass
+
+
+outbox_relay = OutboxRelay()
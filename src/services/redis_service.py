@@ -1,33 +1,76 @@
+import os
 import uuid
 from time import time
 from typing import Optional
 
-from redis.asyncio import from_url
+from redis.asyncio import Redis, from_url
 
 from src.config import config
+from src.utils.metrics import REDIS_ERRORS, REDIS_LATENCY, observed
+
+RELEASE_LOCK_SCRIPT = """
+if redis.call("get", KEYS[1]) == ARGV[1] then
+    return redis.call("del", KEYS[1])
+end
+return 0
+"""
+
+HOLD_LOCK_SCRIPT = """
+local current = redis.call("get", KEYS[1])
+if current == false then
+    return redis.call("set", KEYS[1], ARGV[1], "EX", ARGV[2]) and 1 or 0
+end
+if current == ARGV[1] then
+    return redis.call("expire", KEYS[1], ARGV[2])
+end
+return 0
+"""
 
 
 class RedisService:
     def __init__(self):
-        self.redis = from_url(
-            config.REDIS_URL.get_secret_value(),
-            decode_responses=True
-        )
+        self._redis: Redis | None = None
+
+    @property
+    def redis(self) -> Redis:
+        # Built on first use, so each worker gets its own pool on its own event loop
+        if self._redis is None:
+            self._redis = from_url(
+                config.REDIS_URL.get_secret_value(),
+                decode_responses=True
+            )
+        return self._redis
+
+    async def close(self) -> None:
+        if self._redis is not None:
+            await self._redis.aclose()
+            self._redis = None
+
+    def forget(self) -> None:
+        self._redis = None
+
+    @observed(REDIS_LATENCY, REDIS_ERRORS)
+    async def ping(self) -> bool:
+        return bool(await self.redis.ping())
 
+    @observed(REDIS_LATENCY, REDIS_ERRORS)
     async def get_ban(self, ip: str) -> Optional[int]:
         ban_until = await self.redis.get(f"ban:{ip}")
         return int(ban_until) if ban_until else None
 
+    @observed(REDIS_LATENCY, REDIS_ERRORS)
     async def ban_ip(self, ip: str, seconds: int):
         now = int(time())
         await self.redis.set(f"ban:{ip}", now + seconds, ex=seconds)
 
+    @observed(REDIS_LATENCY, REDIS_ERRORS)
     async def add_request(self, ip: str, window_seconds: int):
         now = int(time())
         key = f"req:{ip}"
         await self.redis.zadd(key, {f"{now}:{uuid.uuid4()}": now})
         await self.redis.expire(key, window_seconds)
 
+    @observed(REDIS_LATENCY, REDIS_ERRORS)
     async def count_requests(self, ip: str, window_seconds: int) -> int:
         now = int(time())
         key = f"req:{ip}"
@@ -37,8 +80,35 @@ class RedisService:
             _, count = await pipe.execute()
         return count
 
+    @observed(REDIS_LATENCY, REDIS_ERRORS)
     async def clear_requests(self, ip: str):
         await self.redis.delete(f"req:{ip}")
 
+    @observed(REDIS_LATENCY, REDIS_ERRORS)
+    async def claim_twitch_message(self, message_id: str, ttl_seconds: int) -> bool:
+        return bool(
+            await self.redis.set(f"twitch:msg:{message_id}", 1, ex=ttl_seconds, nx=True)
+        )
+
+    @observed(REDIS_LATENCY, REDIS_ERRORS)
+    async def release_twitch_message(self, message_id: str):
+        await self.redis.delete(f"twitch:msg:{message_id}")
+
+    @observed(REDIS_LATENCY, REDIS_ERRORS)
+    async def acquire_lock(self, name: str, token: str, ttl_seconds: int) -> bool:
+        return bool(await self.redis.set(f"lock:{name}", token, ex=ttl_seconds, nx=True))
+
+    @observed(REDIS_LATENCY, REDIS_ERRORS)
+    async def hold_lock(self, name: str, token: str, ttl_seconds: int) -> bool:
+        return bool(
+            await self.redis.eval(HOLD_LOCK_SCRIPT, 1, f"lock:{name}", token, ttl_seconds)
+        )
+
+    @observed(REDIS_LATENCY, REDIS_ERRORS)
+    async def release_lock(self, name: str, token: str):
+        await self.redis.eval(RELEASE_LOCK_SCRIPT, 1, f"lock:{name}", token)
+
 
 redis_service = RedisService()
+# A forked child opens its own connection pool
+os.register_at_fork(after_in_child=redis_service.forget)
@@ -10,39 +10,39 @@ logger = getLogger(__name__)
 class ScheduleService:
     @staticmethod
     async def get_schedule(id: int = 1) -> Schedule | None:
-        logger.debug(f"Getting schedule with id: {id}")
+        logger.debug("Getting schedule with id: %s", id)
         schedule = await ScheduleRepository.get_schedule(id)
         if schedule:
-            logger.debug(f"Found schedule with id: {id}")
+            logger.debug("Found schedule with id: %s", id)
         else:
-            logger.debug(f"Schedule with id {id} not found")
+            logger.debug("Schedule with id %s not found", id)
         return schedule
     
     @staticmethod
     async def create_schedule(schedule_data: ScheduleCreate) -> Schedule:
-        logger.debug(f"Creating schedule with data: {schedule_data}")
+        logger.debug("Creating schedule with data: %s", schedule_data)
         schedule = await ScheduleRepository.create_schedule(schedule_data)
-        logger.debug(f"Successfully created schedule with id: {schedule.id}")
+        logger.debug("Successfully created schedule with id: %s", schedule.id)
         return schedule
 
     @staticmethod
     async def update_schedule(id: int, schedule_data: ScheduleUpdate) -> Schedule | None:
-        logger.debug(f"Updating schedule with id: {id} and data: {schedule_data}")
+        logger.debug("Updating schedule with id: %s and data: %s", id, schedule_data)
         schedule = await ScheduleRepository.update_schedule(id, schedule_data)
         if schedule:
-            logger.debug(f"Successfully updated schedule with id: {id}")
+            logger.debug("Successfully updated schedule with id: %s", id)
         else:
-            logger.warning(f"Schedule with id {id} not found for update")
+            logger.warning("Schedule with id %s not found for update", id)
         return schedule
     
     @staticmethod
     async def delete_schedule(id: int) -> bool:
-        logger.debug(f"Attempting to delete schedule with id: {id}")
+        logger.debug("Attempting to delete schedule with id: %s", id)
         deleted = await ScheduleRepository.delete_schedule(id)
         if deleted:
-            logger.debug(f"Successfully deleted schedule with id: {id}")
+            logger.debug("Successfully deleted schedule with id: %s", id)
         else:
-            logger.warning(f"Failed to delete schedule: schedule with id {id} not found")
+            logger.warning("Failed to delete schedule: schedule with id %s not found", id)
         return deleted
     
 
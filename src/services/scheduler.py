@@ -0,0 +1,102 @@
+import asyncio
+import random
+from dataclasses import dataclass, field
+from logging import getLogger
+from typing import Awaitable, Callable
+
+from src.config import config
+from src.services.leader_service import leader_service
+
+logger = getLogger(__name__)
+
+JobFunc = Callable[[], Awaitable[float | None]]
+
+
+@dataclass
+class Job:
+    name: str
+    func: JobFunc
+    interval: float
+    initial_delay: float = 0.0
+    leader_only: bool = False
+    failures: int = 0
+    task: asyncio.Task | None = field(default=None, repr=False)
+
+
+class JobScheduler:
+    def __init__(
+        self,
+        jitter: float = config.SCHEDULER_JITTER,
+        backoff_base: float = config.SCHEDULER_BACKOFF_BASE_SECONDS,
+        backoff_max: float = config.SCHEDULER_BACKOFF_MAX_SECONDS
+    ):
+        self.jitter = jitter
+        self.backoff_base = backoff_base
+        self.backoff_max = backoff_max
+        self.jobs: dict[str, Job] = {}
+
+    def add_job(
+        self,
+        name: str,
+        func: JobFunc,
+        interval: float,
+        initial_delay: float = 0.0,
+        leader_only: bool = False
+    ) -> Job:
+        if name in self.jobs:
+            self.cancel_job(name)
+        job = Job(
+            name=name,
+            func=func,
+            interval=interval,
+            initial_delay=initial_delay,
+            leader_only=leader_only
+        )
+        job.task = asyncio.create_task(self._supervise(job), name=f"job-{name}")
+        self.jobs[name] = job
+        logger.debug("Job '%s' scheduled every %ss", name, interval)
+        return job
+
+    def cancel_job(self, name: str) -> None:
+        if (job := self.jobs.pop(name, None)) and job.task:
+            job.task.cancel()
+
+    async def shutdown(self) -> None:
+        tasks = [job.task for job in self.jobs.values() if job.task]
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+        self.jobs.clear()
+        logger.debug("Job scheduler stopped")
+
+    def _with_jitter(self, delay: float) -> float:
+        return max(0.0, delay * (1 + random.uniform(-self.jitter, self.jitter)))
+
+    def _backoff(self, failures: int) -> float:
+        return min(self.backoff_max, self.backoff_base * 2 ** (failures - 1))
+
+    async def _supervise(self, job: Job) -> None:
+        delay = job.initial_delay
+        while True:
+            await asyncio.sleep(self._with_jitter(delay))
+            if job.leader_only and not leader_service.is_leader:
+                # Checked often, so a new leader picks the job up soon after a failover
+                delay = leader_service.renew_interval
+                continue
+            try:
+                next_delay = await job.func()
+                job.failures = 0
+                delay = job.interval if next_delay is None else max(0.0, next_delay)
+                logger.debug("Job '%s' completed, next run in %.0fs", job.name, delay)
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                job.failures += 1
+                delay = self._backoff(job.failures)
+                logger.error(
+                    "⚠️ Job '%s' failed (%s in a row): %s, retrying in %.0fs",
+                    job.name, job.failures, e, delay
+                )
+
+
+job_scheduler = JobScheduler()
@@ -1,123 +1,282 @@
 import asyncio
+import hashlib
+import hmac
 from datetime import datetime, timedelta, timezone
+from itertools import batched
 from logging import getLogger
+from time import monotonic
+from typing import Any, Iterable, Sequence
 
-from twitchAPI.helper import first
+from twitchAPI.object.api import EventSubSubscription
 from twitchAPI.twitch import Twitch
 
 from src.config import config
+from src.services.scheduler import job_scheduler
+from src.utils.metrics import HELIX_ERRORS, HELIX_LATENCY, observe
 
 logger = getLogger(__name__)
 
+ACTIVE_SUBSCRIPTION_STATUSES = {"enabled", "webhook_callback_verification_pending"}
+HELIX_BATCH_SIZE = 100
+
 
 class TwitchService:
     def __init__(
         self,
-        target_username: str = config.STREAMER_USERNAME,
+        target_usernames: Sequence[str] = (config.STREAMER_USERNAME, *config.STREAMER_USERNAMES),
         callback_url: str = f"{config.BACKEND_URL.get_secret_value()}/v1/webhooks/twitch/callback",
         twitch_client_id: str = config.TWITCH_CLIENT_ID.get_secret_value(),
         twitch_client_secret: str = config.TWITCH_CLIENT_SECRET.get_secret_value(),
-        twitch_webhook_secret: str = config.TWITCH_WEBHOOK_SECRET.get_secret_value()
+        twitch_webhook_secret: str = config.TWITCH_WEBHOOK_SECRET.get_secret_value(),
+        stream_info_ttl: int = config.TWITCH_STREAM_INFO_TTL_SECONDS,
+        api_base_url: str = config.TWITCH_API_BASE_URL,
+        auth_base_url: str = config.TWITCH_AUTH_BASE_URL
     ):
-        self.target_username = target_username
+        self.target_usernames = list(dict.fromkeys(name.lower() for name in target_usernames))
+        self.target_username = self.target_usernames[0]
         self.callback_url = callback_url
         self.twitch_client_id = twitch_client_id
         self.twitch_client_secret = twitch_client_secret
         self.twitch_webhook_secret = twitch_webhook_secret
+        self._webhook_secret_bytes = twitch_webhook_secret.encode("utf-8")
+        self.stream_info_ttl = stream_info_ttl
+        self.api_base_url = api_base_url
+        self.auth_base_url = auth_base_url
 
         self.subscription_online = "stream.online"
         self.subscription_offline = "stream.offline"
+        self.subscription_types = (self.subscription_online, self.subscription_offline)
+        self.subscription_max_age = timedelta(hours=config.TWITCH_SUBSCRIPTION_MAX_AGE_HOURS)
 
-        self.twitch: Twitch
+        self.twitch: Twitch | None = None
         self.user_id: str = "724335221"
+        self.user_ids: dict[str, str] = {self.target_username: self.user_id}
+
+        self._stream_cache: dict[str, tuple[float, dict[str, Any]]] = {}
+        self._stream_refreshes: dict[str, asyncio.Task] = {}
 
     async def startup(self):
         logger.debug("Starting TwitchService...")
-        self.twitch = await Twitch(self.twitch_client_id, self.twitch_client_secret)
+        self.twitch = await Twitch(
+            self.twitch_client_id,
+            self.twitch_client_secret,
+            base_url=self.api_base_url,
+            auth_base_url=self.auth_base_url,
+        )
         logger.debug("Twitch client initialized")
-        user = await first(self.twitch.get_users(logins=[self.target_username]))
-        if user:
-            self.user_id = user.id
-            logger.debug(f"Streamer {self.target_username} found with user_id: {self.user_id}")
-        else:
-            logger.warning(
-                f"Streamer {self.target_username} not found, using default user_id: {self.user_id}"
-            )
-        asyncio.create_task(self._auto_renew_subscription())
-        logger.debug("Auto-renew subscription task started")
+        try:
+            await self.resolve_user_ids()
+        except Exception:
+            await self.twitch.close()
+            self.twitch = None
+            raise
+        job_scheduler.add_job(
+            "twitch-subscription-renewal",
+            self.renew_subscriptions,
+            interval=config.TWITCH_SUBSCRIPTION_CHECK_INTERVAL_SECONDS,
+            leader_only=True,
+        )
+        logger.debug("Subscription renewal job scheduled")
 
     async def shutdown(self):
         logger.debug("Shutting down TwitchService...")
+        if self.twitch is None:
+            return
         await self.twitch.close()
+        self.twitch = None
         logger.debug("Twitch client closed")
 
-    async def get_current_stream_info(self, user_id: str):
-        stream = await first(self.twitch.get_streams(user_id=[user_id]))
-        if stream:
-            return {
-                "title": stream.title,
-                "game_name": stream.game_name,
-                "is_live": True,
-            }
-        return {"title": None, "game_name": None, "is_live": False}
-
-    async def _auto_renew_subscription(self):
-        while True:
-            try:
-                logger.debug("Checking existing EventSub subscriptions...")
-                subs = await self.twitch.get_eventsub_subscriptions()
-                online_sub = None
-                offline_sub = None
-
-                for sub in subs.data:
-                    broadcaster_user_id = sub.condition.get("broadcaster_user_id")
-                    if broadcaster_user_id != self.user_id:
-                        continue
-                    if sub.type == self.subscription_online:
-                        online_sub = sub
-                    elif sub.type == self.subscription_offline:
-                        offline_sub = sub
-
-                if not online_sub or (
-                    online_sub.created_at + timedelta(days=5) < datetime.now(timezone.utc)
-                ):
-                    if online_sub:
-                        await self.twitch.delete_eventsub_subscription(online_sub.id)
-                        logger.debug(f"Online subscription {online_sub.id} deleted")
-                    logger.debug("Creating a new EventSub subscription for stream.online...")
-                    await self.twitch.create_eventsub_subscription(
-                        subscription_type=self.subscription_online,
-                        version="1",
-                        condition={"broadcaster_user_id": self.user_id},
-                        transport={
-                            "method": "webhook",
-                            "callback": self.callback_url,
-                            "secret": self.twitch_webhook_secret
-                        }
-                    )
-                    logger.debug("✅ EventSub subscription for stream.online created/renewed")
-
-                if not offline_sub or (
-                    offline_sub.created_at + timedelta(days=5) < datetime.now(timezone.utc)
+    async def resolve_user_ids(self) -> dict[str, str]:
+        resolved: dict[str, str] = {}
+        for batch in batched(self.target_usernames, HELIX_BATCH_SIZE):
+            with observe(HELIX_LATENCY, HELIX_ERRORS, "get_users"):
+                async for user in self.twitch.get_users(logins=list(batch)):
+                    resolved[user.login.lower()] = user.id
+
+        for username in self.target_usernames:
+            if username in resolved:
+                logger.debug("Streamer %s found with user_id: %s", username, resolved[username])
+            elif username == self.target_username:
+                resolved[username] = self.user_id
+                logger.warning(
+                    "Streamer %s not found, using default user_id: %s", username, self.user_id
+                )
+            else:
+                logger.warning("Streamer %s not found, skipping", username)
+
+        self.user_ids = {
+            name: resolved[name] for name in self.target_usernames if name in resolved
+        }
+        self.user_id = self.user_ids[self.target_username]
+        return self.user_ids
+
+    def verify_signature(
+        self, message_id: str, timestamp: str, body: bytes, signature: str
+    ) -> bool:
+        digest = hmac.new(
+            self._webhook_secret_bytes,
+            message_id.encode("utf-8") + timestamp.encode("utf-8") + body,
+            hashlib.sha256,
+        ).hexdigest()
+        return hmac.compare_digest(f"sha256={digest}", signature)
+
+    def get_cached_stream_info(self, user_id: str) -> dict[str, Any] | None:
+        cached = self._stream_cache.get(user_id)
+        if cached and cached[0] > monotonic():
+            return cached[1]
+        return None
+
+    async def get_current_stream_info(self, user_id: str, force: bool = False) -> dict[str, Any]:
+        if not force and (info := self.get_cached_stream_info(user_id)) is not None:
+            return info
+
+        if not (task := self._stream_refreshes.get(user_id)):
+            task = asyncio.create_task(self._fetch_streams_info([user_id]))
+            self._stream_refreshes[user_id] = task
+            task.add_done_callback(lambda _: self._stream_refreshes.pop(user_id, None))
+        return (await asyncio.shield(task))[user_id]
+
+    async def get_streams_info(self, user_ids: Iterable[str]) -> dict[str, dict[str, Any]]:
+        infos: dict[str, dict[str, Any]] = {}
+        stale: list[str] = []
+        for user_id in dict.fromkeys(user_ids):
+            if (info := self.get_cached_stream_info(user_id)) is not None:
+                infos[user_id] = info
+            else:
+                stale.append(user_id)
+
+        if stale:
+            infos.update(await self._fetch_streams_info(stale))
+        return infos
+
+    async def get_stream_status(self, username: str | None = None) -> dict[str, Any] | None:
+        user_id = self.user_ids.get(username.lower()) if username else self.user_id
+        if user_id is None:
+            return None
+        return await self.get_current_stream_info(user_id)
+
+    async def get_all_stream_statuses(self) -> list[dict[str, Any]]:
+        infos = await self.get_streams_info(self.user_ids.values())
+        return [infos[user_id] for user_id in self.user_ids.values()]
+
+    async def handle_stream_online(self, user_id: str, user_name: str) -> dict[str, Any]:
+        info = await self.get_current_stream_info(user_id, force=True)
+        if not info["is_live"]:
+            logger.debug("Helix has no live stream for %s yet, trusting the webhook", user_name)
+            info = self._store_stream_info(
+                user_id, {**info, "user_name": user_name, "is_live": True}
+            )
+        return info
+
+    def handle_stream_offline(self, user_id: str, user_name: str) -> dict[str, Any]:
+        return self._store_stream_info(user_id, self._offline_stream_info(user_id, user_name))
+
+    async def _fetch_streams_info(self, user_ids: Sequence[str]) -> dict[str, dict[str, Any]]:
+        logger.debug("Fetching stream info for %s broadcasters", len(user_ids))
+        infos: dict[str, dict[str, Any]] = {}
+        for batch in batched(user_ids, HELIX_BATCH_SIZE):
+            with observe(HELIX_LATENCY, HELIX_ERRORS, "get_streams"):
+                streams = [
+                    stream async for stream in
+                    self.twitch.get_streams(user_id=list(batch), first=len(batch))
+                ]
+            for stream in streams:
+                infos[stream.user_id] = {
+                    "user_id": stream.user_id,
+                    "user_name": stream.user_name,
+                    "title": stream.title,
+                    "game_name": stream.game_name,
+                    "viewer_count": stream.viewer_count,
+                    "started_at": stream.started_at.isoformat() if stream.started_at else None,
+                    "is_live": True,
+                }
+
+        return {
+            user_id: self._store_stream_info(
+                user_id, infos.get(user_id) or self._offline_stream_info(user_id)
+            )
+            for user_id in user_ids
+        }
+
+    def _store_stream_info(self, user_id: str, info: dict[str, Any]) -> dict[str, Any]:
+        info["updated_at"] = datetime.now(timezone.utc).isoformat()
+        self._stream_cache[user_id] = (monotonic() + self.stream_info_ttl, info)
+        return info
+
+    @staticmethod
+    def _offline_stream_info(user_id: str, user_name: str | None = None) -> dict[str, Any]:
+        return {
+            "user_id": user_id,
+            "user_name": user_name,
+            "title": None,
+            "game_name": None,
+            "viewer_count": None,
+            "started_at": None,
+            "is_live": False,
+        }
+
+    async def renew_subscriptions(self) -> float:
+        logger.debug("Checking existing EventSub subscriptions...")
+        tracked = set(self.user_ids.values())
+        current: dict[tuple[str, str], EventSubSubscription] = {}
+        with observe(HELIX_LATENCY, HELIX_ERRORS, "get_eventsub_subscriptions"):
+            subscriptions = [sub async for sub in await self.twitch.get_eventsub_subscriptions()]
+        for sub in subscriptions:
+            broadcaster_user_id = sub.condition.get("broadcaster_user_id")
+            if broadcaster_user_id in tracked and sub.type in self.subscription_types:
+                current[(broadcaster_user_id, sub.type)] = sub
+
+        now = datetime.now(timezone.utc)
+        expirations: list[datetime] = []
+        renewals = []
+        for user_id in tracked:
+            for subscription_type in self.subscription_types:
+                sub = current.get((user_id, subscription_type))
+                if sub and sub.status in ACTIVE_SUBSCRIPTION_STATUSES and (
+                    (expires_at := sub.created_at + self.subscription_max_age) > now
                 ):
-                    if offline_sub:
-                        await self.twitch.delete_eventsub_subscription(offline_sub.id)
-                        logger.debug(f"Offline subscription {offline_sub.id} deleted")
-                    logger.debug("Creating a new EventSub subscription for stream.offline...")
-                    await self.twitch.create_eventsub_subscription(
-                        subscription_type=self.subscription_offline,
-                        version="1",
-                        condition={"broadcaster_user_id": self.user_id},
-                        transport={
-                            "method": "webhook",
-                            "callback": self.callback_url,
-                            "secret": self.twitch_webhook_secret
-                        }
-                    )
-                    logger.debug("✅ EventSub subscription for stream.offline created/renewed")
-            except Exception as e:
-                logger.error(f"⚠️ Error while checking/updating subscriptions: {e}")
-            await asyncio.sleep(24 * 60 * 60)
-
-
-twitch_service = TwitchService()
\ No newline at end of file
+                    expirations.append(expires_at)
+                else:
+                    renewals.append(self._renew_subscription(user_id, subscription_type, sub))
+
+        if renewals:
+            results = await asyncio.gather(*renewals, return_exceptions=True)
+            if errors := [result for result in results if isinstance(result, Exception)]:
+                raise errors[0]
+            expirations.append(now + self.subscription_max_age)
+
+        if not expirations:
+            return config.TWITCH_SUBSCRIPTION_CHECK_INTERVAL_SECONDS
+        next_check = (min(expirations) - now).total_seconds()
+        return min(
+            max(next_check, config.TWITCH_SUBSCRIPTION_MIN_CHECK_SECONDS),
+            config.TWITCH_SUBSCRIPTION_CHECK_INTERVAL_SECONDS,
+        )
+
+    async def _renew_subscription(
+        self, user_id: str, subscription_type: str, sub: EventSubSubscription | None
+    ) -> None:
+        if sub:
+            with observe(HELIX_LATENCY, HELIX_ERRORS, "delete_eventsub_subscription"):
+                await self.twitch.delete_eventsub_subscription(sub.id)
+            logger.debug("Subscription %s (%s, %s) deleted", sub.id, subscription_type, sub.status)
+        logger.debug(
+            "Creating a new EventSub subscription for %s (%s)", subscription_type, user_id
+        )
+        with observe(HELIX_LATENCY, HELIX_ERRORS, "create_eventsub_subscription"):
+            await self.twitch.create_eventsub_subscription(
+                subscription_type=subscription_type,
+                version="1",
+                condition={"broadcaster_user_id": user_id},
+                transport={
+                    "method": "webhook",
+                    "callback": self.callback_url,
+                    "secret": self.twitch_webhook_secret
+                }
+            )
+        logger.debug(
+            "✅ EventSub subscription for %s (%s) created/renewed", subscription_type, user_id
+        )
+
+
+twitch_service = TwitchService()
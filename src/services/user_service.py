@@ -2,6 +2,8 @@ from logging import getLogger
 from typing import Optional, Sequence
 
 from aiogram.utils.web_app import WebAppInitData
+from sqlalchemy import Row
+from sqlalchemy.exc import SQLAlchemyError
 
 from src.config import config
 from src.database.models.user import User
@@ -37,14 +39,14 @@ class UserService:
             logger.warning("WebAppInitData provided without user, and no UserCreate fallback")
             return None
 
-        logger.debug(f"Attempting to register user with tg_id: {tg_id}")
+        logger.debug("Attempting to register user with tg_id: %s", tg_id)
         existing = await UserRepository.get_user(tg_id)
         if existing:
-            logger.debug(f"User with tg_id {tg_id} already exists, returning existing user")
+            logger.debug("User with tg_id %s already exists, returning existing user", tg_id)
             return existing
 
         role = UserRole.admin if tg_id in config.ADMIN_IDS else UserRole.user
-        logger.debug(f"Assigned role '{role.value}' to user with tg_id: {tg_id}")
+        logger.debug("Assigned role '%s' to user with tg_id: %s", role.value, tg_id)
         try:
             user = await UserRepository.create_user(
                 UserCreate(
@@ -57,125 +59,138 @@ class UserService:
                 )
             )
             logger.debug(
-                f"Successfully created user with id: {user.id}, tg_id: {tg_id}, role: {role}"
+                "Successfully created user with id: %s, tg_id: %s, role: %s", user.id, tg_id, role
             )
             return user
         except Exception as e:
-            logger.error(f"Failed to create user with tg_id {tg_id}: {e}")
+            logger.error("Failed to create user with tg_id %s: %s", tg_id, e)
             return None
     
     @staticmethod
     async def update_user(tg_id: int, data: UserUpdate) -> User | None:
-        logger.debug(f"Updating user {tg_id} with data: {data}")
+        logger.debug("Updating user %s with data: %s", tg_id, data)
         user = await UserRepository.update_user(tg_id, data)
         if user:
-            logger.debug(f"Successfully updated user {tg_id}")
+            logger.debug("Successfully updated user %s", tg_id)
         else:
-            logger.warning(f"User {tg_id} not found for update")
+            logger.warning("User %s not found for update", tg_id)
         return user
     
     @staticmethod
     async def accept_privacy_policy(tg_id: int) -> User | None:
-        logger.debug(f"User {tg_id} attempts to accept privacy policy")
+        logger.debug("User %s attempts to accept privacy policy", tg_id)
         user = await UserRepository.set_privacy_policy(tg_id, True)
         if user:
-            logger.debug(f"User {tg_id} accepted privacy policy")
+            logger.debug("User %s accepted privacy policy", tg_id)
         else:
-            logger.warning(f"User {tg_id} not found when accepting privacy policy")
+            logger.warning("User %s not found when accepting privacy policy", tg_id)
         return user
 
     @staticmethod
     async def decline_privacy_policy(tg_id: int) -> User | None:
-        logger.debug(f"User {tg_id} attempts to decline privacy policy")
+        logger.debug("User %s attempts to decline privacy policy", tg_id)
         user = await UserRepository.set_privacy_policy(tg_id, False)
         if user:
-            logger.debug(f"User {tg_id} declined privacy policy")
+            logger.debug("User %s declined privacy policy", tg_id)
         else:
-            logger.warning(f"User {tg_id} not found when declining privacy policy")
+            logger.warning("User %s not found when declining privacy policy", tg_id)
         return user
 
     @staticmethod
     async def set_not_new(tg_id: int) -> User | None:
-        logger.debug(f"Setting user {tg_id} as not new (is_new=False)")
+        logger.debug("Setting user %s as not new (is_new=False)", tg_id)
         user = await UserRepository.set_not_new(tg_id)
         if user:
-            logger.debug(f"User {tg_id} is now marked as not new")
+            logger.debug("User %s is now marked as not new", tg_id)
         else:
-            logger.warning(f"User {tg_id} not found when setting is_new=False")
+            logger.warning("User %s not found when setting is_new=False", tg_id)
         return user
 
     @staticmethod
     async def delete_user(tg_id: int) -> bool:
-        logger.debug(f"Attempting to delete user with tg_id: {tg_id}")
+        logger.debug("Attempting to delete user with tg_id: %s", tg_id)
         result = await UserRepository.delete_user(tg_id)
         if result:
-            logger.debug(f"Successfully deleted user with tg_id: {tg_id}")
+            logger.debug("Successfully deleted user with tg_id: %s", tg_id)
         else:
-            logger.warning(f"User with tg_id {tg_id} not found for deletion")
+            logger.warning("User with tg_id %s not found for deletion", tg_id)
         return result
 
     @staticmethod
     async def make_admin(tg_id: int) -> User | None:
-        logger.debug(f"Attempting to make user admin with tg_id: {tg_id}")
+        logger.debug("Attempting to make user admin with tg_id: %s", tg_id)
         user = await UserRepository.set_role(tg_id, UserRole.admin)
         if user:
-            logger.debug(f"Successfully made user admin with tg_id: {tg_id}")
+            logger.debug("Successfully made user admin with tg_id: %s", tg_id)
         else:
-            logger.warning(f"User with tg_id {tg_id} not found when making admin")
+            logger.warning("User with tg_id %s not found when making admin", tg_id)
         return user
 
     @staticmethod
     async def remove_admin(tg_id: int) -> User | None:
-        logger.debug(f"Attempting to remove admin role from user with tg_id: {tg_id}")
+        logger.debug("Attempting to remove admin role from user with tg_id: %s", tg_id)
         user = await UserRepository.set_role(tg_id, UserRole.user)
         if user:
-            logger.debug(f"Successfully removed admin role from user with tg_id: {tg_id}")
+            logger.debug("Successfully removed admin role from user with tg_id: %s", tg_id)
         else:
-            logger.warning(f"User with tg_id {tg_id} not found when removing admin role")
+            logger.warning("User with tg_id %s not found when removing admin role", tg_id)
         return user
 
     @staticmethod
     async def get_user(tg_id: int) -> User | None:
-        logger.debug(f"Getting user with tg_id: {tg_id}")
+        logger.debug("Getting user with tg_id: %s", tg_id)
         user = await UserRepository.get_user(tg_id)
         if user:
-            logger.debug(f"Found user with tg_id: {tg_id}, role: {user.role}")
+            logger.debug("Found user with tg_id: %s, role: %s", tg_id, user.role)
         else:
-            logger.debug(f"User with tg_id {tg_id} not found")
+            logger.debug("User with tg_id %s not found", tg_id)
         return user
 
     @staticmethod
-    async def get_user_by_id(id: int) -> User | None:
-        logger.debug(f"Getting user with id: {id}")
-        user = await UserRepository.get_user_by_id(id)
+    async def is_admin(tg_id: int) -> bool:
+        try:
+            user = await UserRepository.get_user(tg_id)
+        except (SQLAlchemyError, OSError) as e:
+            logger.warning("Failed to check the role of user %s, not an admin: %s", tg_id, e)
+            return False
+        return bool(user and user.role == UserRole.admin)
+
+    @staticmethod
+    async def get_user_by_id(id: int, fields: Sequence[str] | None = None) -> User | Row | None:
+        logger.debug("Getting user with id: %s", id)
+        user = await UserRepository.get_user_by_id(id, fields)
         if user:
-            logger.debug(f"Found user with id: {id}, role: {user.role}")
+            logger.debug("Found user with id: %s, role: %s", id, getattr(user, 'role', None))
         else:
-            logger.debug(f"User with id {id} not found")
+            logger.debug("User with id %s not found", id)
         return user
 
     @staticmethod
-    async def get_admin_by_id(id: int) -> User | None:
-        logger.debug(f"Getting admin with id: {id}")
-        admin = await UserRepository.get_admin_by_id(id)
+    async def get_admin_by_id(id: int, fields: Sequence[str] | None = None) -> User | Row | None:
+        logger.debug("Getting admin with id: %s", id)
+        admin = await UserRepository.get_admin_by_id(id, fields)
         if admin:
-            logger.debug(f"Found admin with id: {id}, role: {admin.role}")
+            logger.debug("Found admin with id: %s", id)
         else:
-            logger.debug(f"Admin with id {id} not found")
+            logger.debug("Admin with id %s not found", id)
         return admin
 
     @staticmethod
-    async def get_all_users(limit: int = 100, offset: int = 0) -> Sequence[User]:
+    async def get_all_users(
+        limit: int = 100, offset: int = 0, fields: Sequence[str] | None = None
+    ) -> Sequence[User] | Sequence[Row]:
         logger.debug("Getting all users")
-        users = await UserRepository.get_users(limit, offset)
-        logger.debug(f"Retrieved {len(users)} users")
+        users = await UserRepository.get_users(limit, offset, fields)
+        logger.debug("Retrieved %s users", len(users))
         return users
 
     @staticmethod
-    async def get_all_admins(limit: int = 100, offset: int = 0) -> Sequence[User]:
+    async def get_all_admins(
+        limit: int = 100, offset: int = 0, fields: Sequence[str] | None = None
+    ) -> Sequence[User] | Sequence[Row]:
         logger.debug("Getting all admin users")
-        admins = await UserRepository.get_admins(limit, offset)
-        logger.debug(f"Retrieved {len(admins)} admin users")
+        admins = await UserRepository.get_admins(limit, offset, fields)
+        logger.debug("Retrieved %s admin users", len(admins))
         return admins
 
 
@@ -1,13 +1,13 @@
-from typing import Any, Dict
+from typing import Any, Dict, Sequence
 
-from fastapi import Request
 from fastapi.routing import APIRoute
+from starlette.routing import BaseRoute
 
 
-def build_api_structure(request: Request, routes: list[APIRoute]) -> Dict[str, Any]:
+def build_api_structure(routes: Sequence[BaseRoute], base_url: str = "") -> Dict[str, Any]:
     structure = {}
     seen_tag_paths = set()
-    base_url = str(request.base_url).rstrip('/')
+    base_url = base_url.rstrip('/')
 
     for route in routes:
         if not isinstance(route, APIRoute):
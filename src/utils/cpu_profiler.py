@@ -0,0 +1,160 @@
+import asyncio
+import json
+import re
+import sys
+import threading
+from contextvars import ContextVar
+from datetime import datetime
+from logging import getLogger
+from pathlib import Path
+from time import perf_counter
+from types import FrameType
+from uuid import uuid4
+
+from src.config import config
+
+logger = getLogger(__name__)
+
+AWAIT_FRAME = ("<await>", "", 0)
+
+
+class SamplingProfiler:
+    def __init__(self, name: str, interval: float):
+        self.name = name
+        self.interval = interval
+        self.profile_id = (
+            f"{datetime.now():%Y%m%d-%H%M%S}-{re.sub(r'[^\w]+', '_', name).strip('_')}"
+            f"-{uuid4().hex[:8]}"
+        )
+        self.loop = asyncio.get_running_loop()
+        self.root = asyncio.current_task()
+        self.thread_id = threading.get_ident()
+        self.frames: list[dict] = []
+        self.frame_index: dict[tuple[str, str, int], int] = {}
+        self.samples: list[list[int]] = []
+        self.weights: list[float] = []
+        self._stopped = threading.Event()
+        self._thread = threading.Thread(target=self._run, name="cpu-profiler", daemon=True)
+
+    def start(self) -> None:
+        self._thread.start()
+
+    def stop(self) -> None:
+        self._stopped.set()
+        self._thread.join()
+
+    def _run(self) -> None:
+        last = perf_counter()
+        while not self._stopped.wait(self.interval):
+            now = perf_counter()
+            try:
+                self._sample((now - last) * 1000)
+            except Exception:
+                # Stacks are read while the loop keeps running, a torn read just loses a sample
+                pass
+            last = now
+
+    def _sample(self, weight: float) -> None:
+        # On-CPU samples come from the loop thread when one of this request's tasks is
+        # running, otherwise the request is waiting and gets its await chain instead
+        task = asyncio.current_task(self.loop)
+        if task is not None and task.get_context().get(active_profiler) is self:
+            frame = sys._current_frames().get(self.thread_id)
+            stack = self._thread_stack(frame)
+        elif self.root is not None:
+            stack = [self._frame_id(frame) for frame in self.root.get_stack()]
+            stack.append(self._intern(AWAIT_FRAME))
+        else:
+            return
+        self.samples.append(stack)
+        self.weights.append(weight)
+
+    def _thread_stack(self, frame: FrameType | None) -> list[int]:
+        frames = []
+        while frame is not None:
+            # Everything below the event loop's callback runner is the same for every sample
+            code = frame.f_code
+            if code.co_name == "_run" and code.co_filename == asyncio.events.__file__:
+                break
+            frames.append(frame)
+            frame = frame.f_back
+        return [self._frame_id(frame) for frame in reversed(frames)]
+
+    def _frame_id(self, frame: FrameType) -> int:
+        code = frame.f_code
+        return self._intern((code.co_qualname, code.co_filename, code.co_firstlineno))
+
+    def _intern(self, key: tuple[str, str, int]) -> int:
+        if (index := self.frame_index.get(key)) is None:
+            index = self.frame_index[key] = len(self.frames)
+            self.frames.append({"name": key[0], "file": key[1], "line": key[2]})
+        return index
+
+    def speedscope(self) -> dict:
+        return {
+            "$schema": "https://www.speedscope.app/file-format-schema.json",
+            "name": self.name,
+            "exporter": config.API_TITLE,
+            "shared": {"frames": self.frames},
+            "profiles": [
+                {
+                    "type": "sampled",
+                    "name": self.name,
+                    "unit": "milliseconds",
+                    "startValue": 0,
+                    "endValue": sum(self.weights),
+                    "samples": self.samples,
+                    "weights": self.weights,
+                }
+            ],
+        }
+
+
+active_profiler: ContextVar[SamplingProfiler | None] = ContextVar(
+    "active_profiler", default=None
+)
+
+
+class ProfileStore:
+    SUFFIX = ".speedscope.json"
+
+    def __init__(self, directory: Path, max_files: int):
+        self.directory = directory
+        self.max_files = max_files
+
+    def save(self, profiler: SamplingProfiler) -> Path:
+        self.directory.mkdir(parents=True, exist_ok=True)
+        path = self.directory / f"{profiler.profile_id}{self.SUFFIX}"
+        path.write_text(json.dumps(profiler.speedscope()), encoding="utf-8")
+        for stale in self._files()[self.max_files:]:
+            stale.unlink(missing_ok=True)
+        logger.info("Saved CPU profile %s (%s samples)", path.name, len(profiler.samples))
+        return path
+
+    def entries(self) -> list[dict]:
+        return [
+            {
+                "id": path.name.removesuffix(self.SUFFIX),
+                "size": path.stat().st_size,
+                "created_at": datetime.fromtimestamp(path.stat().st_mtime).isoformat(),
+            }
+            for path in self._files()
+        ]
+
+    def path(self, profile_id: str) -> Path | None:
+        if not re.fullmatch(r"[\w-]+", profile_id):
+            return None
+        path = self.directory / f"{profile_id}{self.SUFFIX}"
+        return path if path.is_file() else None
+
+    def _files(self) -> list[Path]:
+        if not self.directory.exists():
+            return []
+        return sorted(
+            self.directory.glob(f"*{self.SUFFIX}"),
+            key=lambda path: path.stat().st_mtime,
+            reverse=True,
+        )
+
+
+profile_store = ProfileStore(config.PROFILES_DIR, config.PROFILE_MAX_FILES)
@@ -4,6 +4,8 @@ from aiogram.utils.web_app import WebAppInitData
 from fastapi import Depends
 
 from src.api.utils import auth as auth_func
+from src.api.utils import user_fields
 
 auth = Depends(auth_func)
 UserDep = Annotated[WebAppInitData, auth]
+UserFieldsDep = Annotated[tuple[str, ...] | None, Depends(user_fields)]
@@ -1,18 +1,26 @@
-from typing import List
+from types import MappingProxyType
+from typing import Iterable, Mapping, Sequence
 
-from fastapi import Request
 from fastapi.routing import APIRoute
+from starlette.routing import BaseRoute
 
 
-def get_endpoints_for_version(request: Request, routes: List[APIRoute], version: str) -> List[str]:
-    endpoints = []
+def build_version_index(
+    routes: Sequence[BaseRoute], versions: Iterable[str]
+) -> Mapping[str, tuple[str, ...]]:
+    index: dict[str, list[str]] = {version: [] for version in versions}
     for route in routes:
         if not isinstance(route, APIRoute):
             continue
-        
-        path = route.path
-        base_url = str(request.base_url).rstrip('/')
-        
-        if version in path:
-            endpoints.append(f"{base_url}{path}")
-    return sorted(endpoints)
\ No newline at end of file
+
+        prefix = route.path.strip("/").split("/", 1)[0]
+        if prefix in index:
+            index[prefix].append(route.path)
+    return MappingProxyType({version: tuple(sorted(paths)) for version, paths in index.items()})
+
+
+def get_endpoints_for_version(
+    index: Mapping[str, tuple[str, ...]], version: str, base_url: str = ""
+) -> list[str]:
+    base_url = base_url.rstrip('/')
+    return [f"{base_url}{path}" for path in index.get(version, ())]
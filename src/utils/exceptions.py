@@ -1,5 +1,7 @@
 from fastapi import HTTPException
-from fastapi.responses import JSONResponse
+from fastapi.responses import JSONResponse, Response
+
+from src.utils.server_timing import timed
 
 
 def error_response_http(status_code: int, error: str, details: str) -> HTTPException:
@@ -26,13 +28,26 @@ def success_response(
     data: dict, 
     message: str = "Successful response with API structure"
 ) -> JSONResponse:
-    return JSONResponse(
-        content={
-            "data": data,
-            "message": message
-        },
-        status_code=200
-    )
+    with timed("serialize"):
+        return JSONResponse(
+            content={
+                "data": data,
+                "message": message
+            },
+            status_code=200
+        )
+
+
+def encoded_success_response(content: bytes) -> Response:
+    return Response(content=content, media_type="application/json", status_code=200)
+
+
+def bad_request_error(details: str = "Invalid or missing parameters") -> HTTPException:
+    return error_response_http(400, "Bad Request", details)
+
+
+def bad_request_json_error(details: str = "Invalid or missing parameters") -> JSONResponse:
+    return error_response_json(400, "Bad Request", details)
 
 
 def unauthorized_error(details: str = "Unauthorized access") -> HTTPException:
@@ -56,4 +71,8 @@ def not_found_json_error(details: str = "Resource not found") -> JSONResponse:
 
 
 def too_many_requests_error(details: str = "Rate limit exceeded") -> JSONResponse:
-    return error_response_json(429, "Too Many Requests", details)
\ No newline at end of file
+    return error_response_json(429, "Too Many Requests", details)
+
+
+def service_unavailable_error(details: str = "Service temporarily unavailable") -> JSONResponse:
+    return error_response_json(503, "Service Unavailable", details)
\ No newline at end of file
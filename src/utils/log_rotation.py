@@ -0,0 +1,87 @@
+import gzip
+import os
+import shutil
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+from logging.handlers import TimedRotatingFileHandler
+from pathlib import Path
+from time import time
+
+
+class RotatingLogHandler(TimedRotatingFileHandler):
+    def __init__(
+        self,
+        filename: Path,
+        max_bytes: int,
+        when: str,
+        interval: int,
+        backup_count: int,
+        retention_days: int,
+        compress: bool,
+        stale_glob: str | None = None
+    ):
+        # Rotated files are pruned by this handler, not by the base class
+        super().__init__(filename, when=when, interval=interval, backupCount=0, encoding="utf-8")
+        self.max_bytes = max_bytes
+        self.backup_count = backup_count
+        self.retention_days = retention_days
+        self.compress = compress
+        self.stale_glob = stale_glob
+        self._worker = ThreadPoolExecutor(max_workers=1, thread_name_prefix="log-rotation")
+
+    def shouldRollover(self, record) -> bool:
+        if super().shouldRollover(record):
+            return True
+        if self.max_bytes <= 0:
+            return False
+        if self.stream is None:
+            self.stream = self._open()
+        return self.stream.tell() >= self.max_bytes and os.path.isfile(self.baseFilename)
+
+    def doRollover(self) -> None:
+        if self.stream:
+            self.stream.close()
+            self.stream = None  # type: ignore[assignment]
+
+        if os.path.exists(self.baseFilename) and os.path.getsize(self.baseFilename):
+            rotated = f"{self.baseFilename}.{datetime.now():%Y-%m-%d_%H-%M-%S-%f}"
+            os.rename(self.baseFilename, rotated)
+            self._worker.submit(self._archive, rotated)
+
+        self.rolloverAt = self.computeRollover(int(time()))
+        if not self.delay:
+            self.stream = self._open()
+
+    def close(self) -> None:
+        super().close()
+        self._worker.shutdown(wait=True)
+
+    def _archive(self, rotated: str) -> None:
+        if self.compress:
+            with open(rotated, "rb") as source, gzip.open(f"{rotated}.gz.tmp", "wb") as target:
+                shutil.copyfileobj(source, target)
+            os.replace(f"{rotated}.gz.tmp", f"{rotated}.gz")
+            os.remove(rotated)
+        self._prune()
+
+    def _prune(self) -> None:
+        base = Path(self.baseFilename)
+        backups = sorted(
+            (
+                path for path in base.parent.glob(f"{base.name}.*")
+                if not path.name.endswith(".tmp")
+            ),
+            key=lambda path: path.stat().st_mtime,
+            reverse=True,
+        )
+        expire_before = time() - self.retention_days * 24 * 60 * 60
+        for index, path in enumerate(backups):
+            if index >= self.backup_count or path.stat().st_mtime < expire_before:
+                path.unlink(missing_ok=True)
+
+        if not self.stale_glob:
+            return
+        # Files of workers that have exited are never rotated again, so they only expire by age
+        for path in base.parent.glob(self.stale_glob):
+            if path != base and path.stat().st_mtime < expire_before:
+                path.unlink(missing_ok=True)
@@ -1,6 +1,14 @@
+import atexit
+import json
 import logging
+import os
+import random
+from datetime import datetime, timezone
+from logging.handlers import QueueHandler, QueueListener
+from queue import Full, Queue
 
 from src.config import config_log
+from src.utils.log_rotation import RotatingLogHandler
 
 
 class ColorFormatter(logging.Formatter):
@@ -20,27 +28,167 @@ class ColorFormatter(logging.Formatter):
                 color = self.YELLOW
             elif record.levelno == logging.DEBUG:
                 color = self.MAGENTA
-            
+
+            # Other handlers share the record, so the colors go on a copy
+            record = logging.makeLogRecord(record.__dict__)
             record.levelname = f"{color}{record.levelname}{self.RESET}"
             record.msg = f"{color}{record.msg}{self.RESET}"
             return super().format(record)
 
 
+class JsonFormatter(logging.Formatter):
+    RESERVED_ATTRS = frozenset(vars(logging.makeLogRecord({}))) | {"message", "asctime"}
+
+    def format(self, record: logging.LogRecord) -> str:
+        entry = {
+            "time": datetime.fromtimestamp(record.created, timezone.utc).isoformat(),
+            "level": record.levelname,
+            "logger": record.name,
+            "message": record.getMessage(),
+        }
+        for key, value in record.__dict__.items():
+            if key not in self.RESERVED_ATTRS:
+                entry[key] = value
+        if record.exc_info:
+            entry["exc_info"] = self.formatException(record.exc_info)
+        if record.stack_info:
+            entry["stack_info"] = self.formatStack(record.stack_info)
+        return json.dumps(entry, ensure_ascii=False, default=str)
+
+
+class SamplingFilter(logging.Filter):
+    def __init__(self, rates: dict[str, float], max_level: int = logging.DEBUG):
+        super().__init__()
+        self.rates = rates
+        self.max_level = max_level
+        self._resolved: dict[str, float | None] = {}
+
+    def rate_for(self, name: str) -> float | None:
+        if name not in self._resolved:
+            matches = [
+                prefix for prefix in self.rates
+                if name == prefix or name.startswith(f"{prefix}.")
+            ]
+            self._resolved[name] = self.rates[max(matches, key=len)] if matches else None
+        return self._resolved[name]
+
+    def filter(self, record: logging.LogRecord) -> bool:
+        if record.levelno > self.max_level:
+            return True
+        rate = self.rate_for(record.name)
+        return rate is None or random.random() < rate
+
+
+_configured = False
+_sampling_filter: SamplingFilter | None = None
+
+
 def setup_logging() -> None:
-    color_formatter = ColorFormatter(
-        fmt=config_log.LOG_FORMAT,
-        datefmt=config_log.LOG_DATE_FORMAT
+    global _configured, _sampling_filter
+    if _configured:
+        return
+    _configured = True
+
+    if config_log.LOG_JSON:
+        console_formatter = file_formatter = JsonFormatter()
+    else:
+        console_formatter = ColorFormatter(
+            fmt=config_log.LOG_FORMAT,
+            datefmt=config_log.LOG_DATE_FORMAT
+        )
+        file_formatter = logging.Formatter(
+            fmt=config_log.LOG_FORMAT,
+            datefmt=config_log.LOG_DATE_FORMAT
+        )
+
+    log_file = config_log.LOG_FILE
+    stale_glob = None
+    if config_log.LOG_PER_PROCESS:
+        log_file = log_file.with_name(f"{log_file.stem}.{os.getpid()}{log_file.suffix}")
+        stale_glob = f"{config_log.LOG_FILE.stem}.*{config_log.LOG_FILE.suffix}*"
+
+    stream_handler = logging.StreamHandler()
+    stream_handler.setFormatter(console_formatter)
+    file_handler = RotatingLogHandler(
+        log_file,
+        max_bytes=config_log.LOG_MAX_BYTES,
+        when=config_log.LOG_ROTATE_WHEN,
+        interval=config_log.LOG_ROTATE_INTERVAL,
+        backup_count=config_log.LOG_BACKUP_COUNT,
+        retention_days=config_log.LOG_RETENTION_DAYS,
+        compress=config_log.LOG_COMPRESS,
+        stale_glob=stale_glob
     )
-    
-    logging.basicConfig(
-        level=config_log.LOG_LEVEL,
-        handlers=[
-            logging.StreamHandler(),
-            logging.FileHandler(config_log.LOG_FILE, encoding='utf-8')
-        ]
+    file_handler.setFormatter(file_formatter)
+
+    # Logger filters are skipped for records propagated from child loggers, handler ones are not
+    if config_log.LOG_SAMPLE_RATES:
+        _sampling_filter = SamplingFilter(config_log.LOG_SAMPLE_RATES)
+        stream_handler.addFilter(_sampling_filter)
+        file_handler.addFilter(_sampling_filter)
+
+    logging.basicConfig(level=config_log.LOG_LEVEL, handlers=[stream_handler, file_handler])
+
+
+class BoundedQueueHandler(QueueHandler):
+    def __init__(self, queue: Queue, block: bool):
+        super().__init__(queue)
+        self.block = block
+        self.dropped = 0
+
+    def enqueue(self, record: logging.LogRecord) -> None:
+        if self.block:
+            self.queue.put(record)
+            return
+        try:
+            self.queue.put_nowait(record)
+        except Full:
+            self.dropped += 1
+
+
+_queue_handler: BoundedQueueHandler | None = None
+_listener: QueueListener | None = None
+
+
+def start_log_listener() -> None:
+    global _queue_handler, _listener
+    if _listener:
+        return
+
+    root_logger = logging.getLogger()
+    handlers = list(root_logger.handlers)
+    _queue_handler = BoundedQueueHandler(
+        Queue(maxsize=config_log.LOG_QUEUE_SIZE),
+        block=config_log.LOG_QUEUE_POLICY == "block"
     )
-    
+    _listener = QueueListener(_queue_handler.queue, *handlers, respect_handler_level=True)
+    for handler in handlers:
+        root_logger.removeHandler(handler)
+    if _sampling_filter:
+        # Sampled once before queueing, so every handler keeps or drops the same records
+        _queue_handler.addFilter(_sampling_filter)
+        for handler in handlers:
+            handler.removeFilter(_sampling_filter)
+    root_logger.addHandler(_queue_handler)
+    _listener.start()
+    atexit.register(stop_log_listener)
+
+
+def stop_log_listener() -> None:
+    global _queue_handler, _listener
+    if not _listener or not _queue_handler:
+        return
+
     root_logger = logging.getLogger()
-    for handler in root_logger.handlers:
-        if isinstance(handler, logging.StreamHandler):
-            handler.setFormatter(color_formatter)
\ No newline at end of file
+    root_logger.removeHandler(_queue_handler)
+    _listener.stop()
+    for handler in _listener.handlers:
+        if _sampling_filter:
+            handler.addFilter(_sampling_filter)
+        root_logger.addHandler(handler)
+
+    if _queue_handler.dropped:
+        logging.getLogger(__name__).warning(
+            "Dropped %s log records, the log queue was full", _queue_handler.dropped
+        )
+    _queue_handler = _listener = None
@@ -0,0 +1,113 @@
+import os
+from contextlib import contextmanager
+from functools import wraps
+from time import perf_counter
+from typing import Iterator
+
+from prometheus_client import (
+    CONTENT_TYPE_LATEST,
+    CollectorRegistry,
+    Counter,
+    Gauge,
+    Histogram,
+    generate_latest,
+    multiprocess,
+)
+
+FAST_BUCKETS = (0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5)
+
+HTTP_REQUESTS = Counter(
+    "http_requests_total", "HTTP requests", ["method", "route", "status"]
+)
+HTTP_LATENCY = Histogram(
+    "http_request_duration_seconds", "HTTP request latency", ["method", "route", "status"]
+)
+DB_QUERY_LATENCY = Histogram(
+    "db_query_duration_seconds", "Database query latency", ["engine", "operation"],
+    buckets=FAST_BUCKETS
+)
+DB_POOL_CHECKOUT_WAIT = Histogram(
+    "db_pool_checkout_wait_seconds", "Time spent waiting for a pooled connection", ["engine"],
+    buckets=FAST_BUCKETS
+)
+DB_POOL_TIMEOUTS = Counter(
+    "db_pool_timeouts_total", "Pool checkouts that timed out", ["engine"]
+)
+DB_POOL_CHECKED_OUT = Gauge(
+    "db_pool_checked_out", "Connections checked out of the pool", ["engine"],
+    multiprocess_mode="livesum"
+)
+REDIS_LATENCY = Histogram(
+    "redis_call_duration_seconds", "RedisService call latency", ["method"],
+    buckets=FAST_BUCKETS
+)
+REDIS_ERRORS = Counter("redis_call_errors_total", "Failed RedisService calls", ["method"])
+BROKER_PUBLISH_LATENCY = Histogram(
+    "broker_publish_duration_seconds", "RabbitMQ publish latency", ["queue"],
+    buckets=FAST_BUCKETS
+)
+BROKER_PUBLISH_ERRORS = Counter(
+    "broker_publish_errors_total", "Failed RabbitMQ publishes", ["queue"]
+)
+HELIX_LATENCY = Histogram(
+    "twitch_helix_call_duration_seconds", "Twitch Helix call latency", ["call"]
+)
+HELIX_ERRORS = Counter("twitch_helix_call_errors_total", "Failed Twitch Helix calls", ["call"])
+RATE_LIMIT_VERDICTS = Counter(
+    "rate_limit_verdicts_total", "Rate limiter decisions", ["verdict"]
+)
+EVENT_LOOP_LAG = Histogram(
+    "event_loop_lag_seconds", "Delay before the event loop runs a callback from another thread",
+    buckets=FAST_BUCKETS
+)
+EVENT_LOOP_STALLS = Counter(
+    "event_loop_stalls_total", "Times the event loop was blocked past the lag threshold"
+)
+OUTBOX_PENDING = Gauge(
+    "outbox_pending", "Outbox messages waiting to be published",
+    multiprocess_mode="livemostrecent"
+)
+OUTBOX_LAG = Gauge(
+    "outbox_oldest_pending_age_seconds", "Age of the oldest unpublished outbox message",
+    multiprocess_mode="livemostrecent"
+)
+WEBHOOK_REJECTIONS = Counter(
+    "webhook_rejections_total", "Webhook deliveries answered with an error", ["source", "reason"]
+)
+
+
+@contextmanager
+def observe(histogram: Histogram, errors: Counter, *labels: str) -> Iterator[None]:
+    started = perf_counter()
+    try:
+        yield
+    except Exception:
+        errors.labels(*labels).inc()
+        raise
+    finally:
+        histogram.labels(*labels).observe(perf_counter() - started)
+
+
+def observed(histogram: Histogram, errors: Counter):
+    def decorator(func):
+        @wraps(func)
+        async def wrapper(*args, **kwargs):
+            with observe(histogram, errors, func.__name__):
+                return await func(*args, **kwargs)
+
+        return wrapper
+
+    return decorator
+
+
+def render_metrics() -> tuple[bytes, str]:
+    if os.environ.get("PROMETHEUS_MULTIPROC_DIR"):
+        registry = CollectorRegistry()
+        multiprocess.MultiProcessCollector(registry)
+        return generate_latest(registry), CONTENT_TYPE_LATEST
+    return generate_latest(), CONTENT_TYPE_LATEST
+
+
+def mark_process_dead() -> None:
+    if os.environ.get("PROMETHEUS_MULTIPROC_DIR"):
+        multiprocess.mark_process_dead(os.getpid())
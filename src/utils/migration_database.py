@@ -1,7 +1,10 @@
 import argparse
 from logging import getLogger
 
-from src.utils.command_runner import run_command
+from alembic import command
+from alembic.util import CommandError
+
+from src.database.migrations import alembic_config
 from src.utils.logger import setup_logging
 
 logger = getLogger(__name__)
@@ -12,26 +15,37 @@ def main():
 
     parser = argparse.ArgumentParser(description='Database migration tool')
     subparsers = parser.add_subparsers(dest='command', required=True)
-    migrate_parser = subparsers.add_parser('commit', help='Run database migrations')
+    migrate_parser = subparsers.add_parser('commit', help='Create and apply a new migration')
     migrate_parser.add_argument('commit', help='Name of the migration commit')
-    
+    upgrade_parser = subparsers.add_parser('upgrade', help='Apply migrations')
+    upgrade_parser.add_argument('revision', nargs='?', default='head', help='Target revision')
+    stamp_parser = subparsers.add_parser('stamp', help='Mark the database as migrated')
+    stamp_parser.add_argument('revision', help='Revision to stamp')
+    subparsers.add_parser('current', help='Show the current database revision')
+
     args = parser.parse_args()
-    
-    if args.command == 'commit':
-        logger.info(f"Starting database migration process: {args.commit}")
-        logger.info("Creating database migration...")
-        success, output = run_command(f'alembic revision --autogenerate -m "{args.commit}"')
-        if not success:
-            return logger.error("Migration creation failed")
-        
-        logger.info("Migration created successfully")
-        logger.info("Applying database migration...")
-        success, output = run_command('alembic upgrade head')
-        if not success:
-            return logger.error("Migration application failed")
-
-        logger.info("Migration applied successfully")
+    alembic_cfg = alembic_config()
+
+    try:
+        if args.command == 'commit':
+            logger.info("Starting database migration process: %s", args.commit)
+            logger.info("Creating database migration...")
+            command.revision(alembic_cfg, message=args.commit, autogenerate=True)
+            logger.info("Migration created successfully")
+            args.revision = 'head'
+
+        if args.command in ('commit', 'upgrade'):
+            logger.info("Applying database migrations up to %s...", args.revision)
+            command.upgrade(alembic_cfg, args.revision)
+            logger.info("Migration applied successfully")
+        elif args.command == 'stamp':
+            command.stamp(alembic_cfg, args.revision)
+            logger.info("Database stamped with revision %s", args.revision)
+        elif args.command == 'current':
+            command.current(alembic_cfg)
+    except CommandError as e:
+        logger.error("Migration failed: %s", e)
 
 
 if __name__ == "__main__":
-    main()
\ No newline at end of file
+    main()
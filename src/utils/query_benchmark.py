@@ -0,0 +1,76 @@
+import argparse
+import asyncio
+import os
+import tempfile
+from logging import getLogger
+from pathlib import Path
+from time import perf_counter
+from typing import Awaitable, Callable
+
+logger = getLogger(__name__)
+
+TG_ID = 1
+DB_PATH = Path(tempfile.gettempdir()) / "query_benchmark.db"
+
+
+async def _round_trip(get_user: Callable[[int], Awaitable[object]], iterations: int) -> float:
+    for _ in range(min(iterations, 100)):
+        await get_user(TG_ID)
+    started = perf_counter()
+    for _ in range(iterations):
+        await get_user(TG_ID)
+    return (perf_counter() - started) / iterations
+
+
+async def run(iterations: int, rounds: int) -> None:
+    from sqlalchemy import select
+
+    from src.database import async_session, close_db, init_db
+    from src.database.models import User
+    from src.database.repositories.user import UserRepository
+    from src.database.unit_of_work import session_scope
+    from src.schemas.user import UserCreate
+
+    async def get_user_inline(tg_id: int) -> User | None:
+        # What UserRepository.get_user did before its statement was prebuilt
+        async with session_scope(async_session) as session:
+            return await session.scalar(select(User).where(User.tg_id == tg_id)) or None
+
+    await init_db()
+    await UserRepository.create_user(UserCreate(tg_id=TG_ID, first_name="benchmark"))
+
+    results: dict[str, list[float]] = {"before": [], "after": []}
+    for _ in range(rounds):
+        results["before"].append(await _round_trip(get_user_inline, iterations))
+        results["after"].append(await _round_trip(UserRepository.get_user, iterations))
+    await close_db()
+
+    before, after = min(results["before"]), min(results["after"])
+    logger.info(
+        "get_user round trip (best of %s): before=%.1fus after=%.1fus saved=%.1fus per call",
+        rounds, before * 1e6, after * 1e6, (before - after) * 1e6
+    )
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description=(
+            "UserRepository.get_user overhead microbenchmark, "
+            "runs against a throwaway SQLite database (needs the dev group)"
+        )
+    )
+    parser.add_argument("--iterations", type=int, default=5000, help="Calls per round")
+    parser.add_argument("--rounds", type=int, default=5, help="Rounds, the best one is reported")
+    args = parser.parse_args()
+
+    DB_PATH.unlink(missing_ok=True)
+    os.environ["DB_URL"] = f"sqlite+aiosqlite:///{DB_PATH}"
+
+    from src.utils.logger import setup_logging
+
+    setup_logging()
+    asyncio.run(run(args.iterations, args.rounds))
+
+
+if __name__ == "__main__":
+    main()
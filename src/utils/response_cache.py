@@ -0,0 +1,43 @@
+import json
+from collections import OrderedDict
+from typing import Any
+
+BASE_URL_PLACEHOLDER = "{base_url}"
+
+
+class BaseUrlResponseCache:
+    def __init__(self, maxsize: int = 16):
+        self.maxsize = maxsize
+        self._template: bytes | None = None
+        # Host header is client controlled, so rendered bodies are kept in a bounded LRU
+        self._rendered: OrderedDict[str, bytes] = OrderedDict()
+
+    @property
+    def ready(self) -> bool:
+        return self._template is not None
+
+    def set(self, content: Any) -> None:
+        self._template = json.dumps(
+            content,
+            ensure_ascii=False,
+            allow_nan=False,
+            indent=None,
+            separators=(",", ":"),
+        ).encode("utf-8")
+        self._rendered.clear()
+
+    def render(self, base_url: str = "") -> bytes:
+        if self._template is None:
+            raise RuntimeError("Response cache is not built yet")
+
+        base_url = base_url.rstrip("/")
+        if (body := self._rendered.get(base_url)) is not None:
+            self._rendered.move_to_end(base_url)
+            return body
+
+        escaped = json.dumps(base_url, ensure_ascii=False)[1:-1].encode("utf-8")
+        body = self._template.replace(BASE_URL_PLACEHOLDER.encode("utf-8"), escaped)
+        self._rendered[base_url] = body
+        if len(self._rendered) > self.maxsize:
+            self._rendered.popitem(last=False)
+        return body
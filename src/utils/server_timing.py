@@ -0,0 +1,51 @@
+from contextlib import contextmanager
+from contextvars import ContextVar
+from time import perf_counter
+from typing import Iterator
+
+
+class ServerTiming:
+    def __init__(self, enabled: bool):
+        self.enabled = enabled
+        self.started = perf_counter()
+        self.phases: dict[str, list[float]] = {}
+
+    def add(self, name: str, duration: float) -> None:
+        phase = self.phases.setdefault(name, [0.0, 0])
+        phase[0] += duration
+        phase[1] += 1
+
+    def header(self) -> str:
+        entries = [
+            f'{name};dur={total * 1000:.2f};desc="{count} calls"' if count > 1
+            else f"{name};dur={total * 1000:.2f}"
+            for name, (total, count) in self.phases.items()
+        ]
+        entries.append(f"total;dur={(perf_counter() - self.started) * 1000:.2f}")
+        return ", ".join(entries)
+
+
+server_timing: ContextVar[ServerTiming | None] = ContextVar("server_timing", default=None)
+
+
+@contextmanager
+def timed(name: str) -> Iterator[None]:
+    if (timing := server_timing.get()) is None:
+        yield
+        return
+
+    started = perf_counter()
+    try:
+        yield
+    finally:
+        timing.add(name, perf_counter() - started)
+
+
+def server_timing_pending() -> bool:
+    timing = server_timing.get()
+    return timing is not None and not timing.enabled
+
+
+def allow_server_timing() -> None:
+    if (timing := server_timing.get()) is not None:
+        timing.enabled = True
@@ -0,0 +1,390 @@
+import argparse
+import asyncio
+import hashlib
+import hmac
+import json
+import os
+import random
+import socket
+import tempfile
+import uuid
+from collections import Counter
+from datetime import datetime, timezone
+from logging import getLogger
+from time import perf_counter
+
+from aiohttp import ClientSession, ClientTimeout, web
+
+logger = getLogger(__name__)
+
+CALLBACK_PATH = "/v1/webhooks/twitch/callback"
+WEBHOOK_SECRET = "load-test-webhook-secret"
+
+
+def _free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+def _percentile(values: list[float], percent: float) -> float:
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    index = min(len(ordered) - 1, max(0, round(percent / 100 * len(ordered)) - 1))
+    return ordered[index]
+
+
+class FakeHelix:
+    def __init__(self, broadcasters: list[str], latency: float = 0.0):
+        self.latency = latency
+        self.users = {login: str(100000 + i) for i, login in enumerate(broadcasters)}
+        self.live: set[str] = set()
+        self.requests: Counter[str] = Counter()
+
+        self.app = web.Application()
+        self.app.router.add_post("/oauth2/token", self._token)
+        self.app.router.add_get("/oauth2/validate", self._validate)
+        self.app.router.add_get("/helix/users", self._get_users)
+        self.app.router.add_get("/helix/streams", self._get_streams)
+        self.app.router.add_get("/helix/eventsub/subscriptions", self._get_subscriptions)
+        self.app.router.add_post("/helix/eventsub/subscriptions", self._create_subscription)
+        self.app.router.add_delete("/helix/eventsub/subscriptions", self._delete_subscription)
+        self._runner: web.AppRunner | None = None
+
+    async def start(self, port: int) -> None:
+        self._runner = web.AppRunner(self.app, access_log=None)
+        await self._runner.setup()
+        await web.TCPSite(self._runner, "127.0.0.1", port).start()
+
+    async def stop(self) -> None:
+        if self._runner:
+            await self._runner.cleanup()
+
+    async def _delay(self, name: str) -> None:
+        self.requests[name] += 1
+        if self.latency:
+            await asyncio.sleep(self.latency)
+
+    async def _token(self, request: web.Request) -> web.Response:
+        await self._delay("token")
+        return web.json_response(
+            {"access_token": "load-test-token", "expires_in": 3600, "token_type": "bearer"}
+        )
+
+    async def _validate(self, request: web.Request) -> web.Response:
+        await self._delay("validate")
+        return web.json_response({"client_id": "load-test", "scopes": [], "expires_in": 3600})
+
+    async def _get_users(self, request: web.Request) -> web.Response:
+        await self._delay("users")
+        data = [
+            {
+                "id": self.users[login],
+                "login": login,
+                "display_name": login,
+                "type": "",
+                "broadcaster_type": "",
+                "description": "",
+                "profile_image_url": "",
+                "offline_image_url": "",
+                "view_count": 0,
+                "created_at": "2020-01-01T00:00:00Z",
+            }
+            for login in request.query.getall("login", [])
+            if login in self.users
+        ]
+        return web.json_response({"data": data})
+
+    async def _get_streams(self, request: web.Request) -> web.Response:
+        await self._delay("streams")
+        logins = {user_id: login for login, user_id in self.users.items()}
+        data = [
+            {
+                "id": uuid.uuid4().hex,
+                "user_id": user_id,
+                "user_login": logins.get(user_id, user_id),
+                "user_name": logins.get(user_id, user_id),
+                "game_id": "1",
+                "game_name": "Just Chatting",
+                "type": "live",
+                "title": "Load test stream",
+                "tags": [],
+                "viewer_count": random.randint(1, 1000),
+                "started_at": datetime.now(timezone.utc).strftime("%Y-%m-%dT%H:%M:%SZ"),
+                "language": "en",
+                "thumbnail_url": "",
+                "is_mature": False,
+            }
+            for user_id in request.query.getall("user_id", [])
+            if user_id in self.live
+        ]
+        return web.json_response({"data": data, "pagination": {}})
+
+    async def _get_subscriptions(self, request: web.Request) -> web.Response:
+        await self._delay("subscriptions")
+        return web.json_response(
+            {"data": [], "total": 0, "total_cost": 0, "max_total_cost": 10000, "pagination": {}}
+        )
+
+    async def _create_subscription(self, request: web.Request) -> web.Response:
+        await self._delay("create_subscription")
+        body = await request.json()
+        return web.json_response(
+            {
+                "data": [
+                    {
+                        "id": uuid.uuid4().hex,
+                        "status": "webhook_callback_verification_pending",
+                        "type": body["type"],
+                        "version": body["version"],
+                        "condition": body["condition"],
+                        "created_at": datetime.now(timezone.utc).isoformat(),
+                        "transport": {
+                            "method": "webhook",
+                            "callback": body["transport"]["callback"]
+                        },
+                        "cost": 1,
+                    }
+                ],
+                "total": 1,
+                "total_cost": 1,
+                "max_total_cost": 10000,
+            },
+            status=202,
+        )
+
+    async def _delete_subscription(self, request: web.Request) -> web.Response:
+        await self._delay("delete_subscription")
+        return web.Response(status=204)
+
+
+class DeliveryFactory:
+    def __init__(self, secret: str, broadcasters: dict[str, str]):
+        self.secret = secret.encode("utf-8")
+        self.broadcasters = list(broadcasters.items())
+        self.sent: list[tuple[dict[str, str], bytes]] = []
+
+    def new(self) -> tuple[dict[str, str], bytes]:
+        login, user_id = random.choice(self.broadcasters)
+        subscription_type = random.choice(("stream.online", "stream.offline"))
+        body = json.dumps(
+            {
+                "subscription": {
+                    "id": uuid.uuid4().hex,
+                    "type": subscription_type,
+                    "version": "1",
+                    "status": "enabled",
+                    "condition": {"broadcaster_user_id": user_id},
+                },
+                "event": {
+                    "broadcaster_user_id": user_id,
+                    "broadcaster_user_login": login,
+                    "broadcaster_user_name": login,
+                    "type": "live",
+                    "started_at": datetime.now(timezone.utc).isoformat(),
+                },
+            }
+        ).encode("utf-8")
+        delivery = (self.sign(uuid.uuid4().hex, body), body)
+        self.sent.append(delivery)
+        return delivery
+
+    def duplicate(self) -> tuple[dict[str, str], bytes]:
+        if not self.sent:
+            return self.new()
+        return random.choice(self.sent)
+
+    def sign(self, message_id: str, body: bytes) -> dict[str, str]:
+        timestamp = datetime.now(timezone.utc).isoformat()
+        digest = hmac.new(
+            self.secret, message_id.encode() + timestamp.encode() + body, hashlib.sha256
+        ).hexdigest()
+        return {
+            "Content-Type": "application/json",
+            "Twitch-Eventsub-Message-Id": message_id,
+            "Twitch-Eventsub-Message-Timestamp": timestamp,
+            "Twitch-Eventsub-Message-Signature": f"sha256={digest}",
+            "Twitch-Eventsub-Message-Type": "notification",
+        }
+
+
+async def _deliver(
+    session: ClientSession,
+    url: str,
+    delivery: tuple[dict[str, str], bytes],
+    latencies: list[float],
+    statuses: Counter
+) -> None:
+    headers, body = delivery
+    started = perf_counter()
+    try:
+        async with session.post(url, data=body, headers=headers) as response:
+            await response.read()
+            statuses[response.status] += 1
+    except Exception as e:
+        statuses[type(e).__name__] += 1
+        return
+    latencies.append(perf_counter() - started)
+
+
+async def _replay(args: argparse.Namespace, url: str, factory: DeliveryFactory) -> dict:
+    latencies: list[float] = []
+    statuses: Counter = Counter()
+    tasks: set[asyncio.Task] = set()
+    sent = duplicates = ticks = 0
+
+    async with ClientSession(timeout=ClientTimeout(total=30)) as session:
+        started = perf_counter()
+        next_burst = started + args.burst_every if args.burst_every else None
+        interval = 1 / args.rate
+        while (now := perf_counter()) - started < args.duration:
+            batch = 1
+            if next_burst and now >= next_burst:
+                batch = args.burst_size
+                next_burst += args.burst_every
+            for _ in range(batch):
+                if random.random() < args.duplicates:
+                    delivery = factory.duplicate()
+                    duplicates += 1
+                else:
+                    delivery = factory.new()
+                task = asyncio.create_task(_deliver(session, url, delivery, latencies, statuses))
+                tasks.add(task)
+                task.add_done_callback(tasks.discard)
+                sent += 1
+            ticks += 1
+            await asyncio.sleep(max(0.0, started + ticks * interval - perf_counter()))
+        await asyncio.gather(*tasks)
+        elapsed = perf_counter() - started
+
+    return {
+        "sent": sent,
+        "duplicates": duplicates,
+        "elapsed": elapsed,
+        "statuses": dict(statuses),
+        "latencies": latencies,
+    }
+
+
+def _parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(
+        description=(
+            "Twitch webhook pipeline load test. Needs a running Redis at REDIS_URL, "
+            "Twitch Helix and RabbitMQ are faked."
+        )
+    )
+    parser.add_argument("--rate", type=float, default=200, help="Deliveries per second")
+    parser.add_argument("--duration", type=float, default=10, help="Test duration in seconds")
+    parser.add_argument(
+        "--duplicates", type=float, default=0.1, help="Share of retried (duplicate) deliveries"
+    )
+    parser.add_argument("--burst-size", type=int, default=200, help="Deliveries per burst")
+    parser.add_argument(
+        "--burst-every", type=float, default=5, help="Seconds between bursts, 0 disables bursts"
+    )
+    parser.add_argument("--broadcasters", type=int, default=10, help="Tracked broadcasters")
+    parser.add_argument(
+        "--helix-latency", type=float, default=0.05, help="Fake Helix latency in seconds"
+    )
+    parser.add_argument(
+        "--sqlite",
+        action="store_true",
+        help="Use a throwaway SQLite database instead of DB_URL (needs the dev group)"
+    )
+    return parser.parse_args()
+
+
+def _prepare_environment(
+    helix_port: int, app_port: int, broadcasters: list[str], sqlite: bool
+) -> None:
+    os.environ.update(
+        {
+            "TWITCH_API_BASE_URL": f"http://127.0.0.1:{helix_port}/helix/",
+            "TWITCH_AUTH_BASE_URL": f"http://127.0.0.1:{helix_port}/oauth2/",
+            "TWITCH_WEBHOOK_SECRET": WEBHOOK_SECRET,
+            "STREAMER_USERNAME": broadcasters[0],
+            "STREAMER_USERNAMES": json.dumps(broadcasters[1:]),
+            "BACKEND_URL": f"http://127.0.0.1:{app_port}",
+        }
+    )
+    if sqlite:
+        os.environ["DB_URL"] = (
+            f"sqlite+aiosqlite:///{tempfile.gettempdir()}/webhook_load_test.db"
+        )
+
+
+async def run(
+    args: argparse.Namespace, helix_port: int, app_port: int, broadcasters: list[str]
+) -> None:
+    import uvicorn
+    from faststream.rabbit import TestRabbitBroker
+
+    from src.api.v1.webhooks.twitch import router as twitch_router
+    from src.app import app
+
+    helix = FakeHelix(broadcasters, latency=args.helix_latency)
+    helix.live = set(helix.users.values())
+    await helix.start(helix_port)
+
+    published: list[float] = []
+
+    @twitch_router.broker.subscriber("twitch_streams")
+    async def count_published(message: dict) -> None:
+        published.append(perf_counter())
+
+    server = uvicorn.Server(
+        uvicorn.Config(app, host="127.0.0.1", port=app_port, log_config=None, access_log=False)
+    )
+    async with TestRabbitBroker(twitch_router.broker):
+        serve_task = asyncio.create_task(server.serve())
+        while not server.started:
+            await asyncio.sleep(0.05)
+
+        factory = DeliveryFactory(WEBHOOK_SECRET, helix.users)
+        url = f"http://127.0.0.1:{app_port}{CALLBACK_PATH}"
+        logger.info(
+            "Replaying deliveries to %s for %ss at %s/s", url, args.duration, args.rate
+        )
+        result = await _replay(args, url, factory)
+        replay_finished = perf_counter()
+
+        accepted = result["sent"] - result["duplicates"]
+        while len(published) < accepted and perf_counter() - replay_finished < 30:
+            await asyncio.sleep(0.1)
+        publish_elapsed = (max(published) - min(published)) if len(published) > 1 else 0.0
+
+        server.should_exit = True
+        await serve_task
+    await helix.stop()
+
+    latencies = [value * 1000 for value in result["latencies"]]
+    logger.info("Deliveries sent: %s (%s duplicates)", result["sent"], result["duplicates"])
+    logger.info("Offered rate: %.1f/s", result["sent"] / result["elapsed"])
+    logger.info("Response statuses: %s", result["statuses"])
+    logger.info(
+        "Ack latency ms: p50=%.2f p90=%.2f p99=%.2f max=%.2f",
+        _percentile(latencies, 50), _percentile(latencies, 90),
+        _percentile(latencies, 99), max(latencies, default=0)
+    )
+    logger.info(
+        "Published: %s messages, %.1f/s",
+        len(published), len(published) / publish_elapsed if publish_elapsed else 0
+    )
+    logger.info("Helix requests: %s", dict(helix.requests))
+
+
+def main():
+    args = _parse_args()
+    helix_port, app_port = _free_port(), _free_port()
+    broadcasters = [f"loadtest_streamer_{i}" for i in range(args.broadcasters)]
+    _prepare_environment(helix_port, app_port, broadcasters, args.sqlite)
+
+    from src.utils.logger import setup_logging
+
+    setup_logging()
+    asyncio.run(run(args, helix_port, app_port, broadcasters))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,46 @@
+import asyncio
+import os
+import tempfile
+from pathlib import Path
+
+import pytest
+
+DB_PATH = Path(tempfile.gettempdir()) / "backend_tests.db"
+# Settings are read at import time, so the test database has to be chosen before any src import
+os.environ["DB_URL"] = f"sqlite+aiosqlite:///{DB_PATH}"
+
+
+async def _create_schema() -> None:
+    from src.database.base import engine
+    from src.database.models import Base
+
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.create_all)
+    await engine.dispose()
+
+
+async def _no_ban(ip: str) -> None:
+    return None
+
+
+async def _no_requests(ip: str, window_seconds: int) -> int:
+    return 0
+
+
+@pytest.fixture(scope="session")
+def client():
+    from fastapi.testclient import TestClient
+
+    from src.app import app
+    from src.services.redis_service import redis_service
+
+    DB_PATH.unlink(missing_ok=True)
+    asyncio.run(_create_schema())
+
+    # The rate limiter is the only Redis user on these paths, the lifespan is not started
+    with pytest.MonkeyPatch.context() as patch:
+        patch.setattr(redis_service, "get_ban", _no_ban)
+        patch.setattr(redis_service, "count_requests", _no_requests)
+        patch.setattr(redis_service, "add_request", _no_requests)
+        yield TestClient(app)
+    DB_PATH.unlink(missing_ok=True)
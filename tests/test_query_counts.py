@@ -0,0 +1,31 @@
+from src.database.profiler import assert_max_queries
+
+
+def _create_user(client, tg_id: int) -> dict:
+    response = client.post("/v1/users/create", json={"tg_id": tg_id, "first_name": f"user{tg_id}"})
+    assert response.status_code == 200, response.text
+    return response.json()["data"]["user"]
+
+
+def test_create_user_queries(client):
+    with assert_max_queries(5):
+        _create_user(client, 1001)
+
+
+def test_get_user_queries(client):
+    user = _create_user(client, 1002)
+
+    with assert_max_queries(1):
+        response = client.get("/v1/users/get", params={"id": user["id"]})
+    assert response.status_code == 200
+    assert response.json()["data"]["user"]["tg_id"] == 1002
+
+
+def test_list_users_queries(client):
+    for tg_id in range(1100, 1120):
+        _create_user(client, tg_id)
+
+    with assert_max_queries(1):
+        response = client.get("/v1/users/", params={"limit": 50})
+    assert response.status_code == 200
+    assert len(response.json()["data"]["users"]) >= 20